@@ -1,24 +1,567 @@
+import cmath
 import math
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+
 import numpy as np
 
+from geometry_cache import cache_key, cached_array
+
+# Unit steps of the hexagonal (Eisenstein integer) lattice, one per 60 degree heading,
+# as (a, b) coefficients of a + b * w with w = exp(i * pi / 3)
+EISENSTEIN_STEPS = np.array([(1, 0), (0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1)], dtype=np.int64)
+EISENSTEIN_OMEGA = complex(0.5, math.sqrt(3) / 2)
 
-class GosperCurve:
+
+class LSystem:
     """
-    Represents the Gosper curve (also known as the Peano-Gosper curve or flowsnake)
-    in the context of L-systems.
+    Generic L-system (Lindenmayer system) rewrite engine.
 
-    The Gosper curve is a space-filling curve that can be generated iteratively using
-    L-system (Lindenmayer system) rules. This class provides functionalities to generate
-    the pattern for a specified number of stages, and convert that pattern into a
-    corresponding list of line segments based on a starting point and direction.
+    A concrete system is described by class attributes, so presets such as
+    :class:`GosperCurve` are simple subclasses. Every rewrite step is done with
+    ``str.translate`` and a prebuilt translation table, which expands the whole
+    stage in a single pass at C speed and allocates one string per stage.
 
-    :ivar RULES: The L-system rules to generate the Gosper curve.
+    :ivar RULES: The production rules; symbols without a rule are copied as is.
     :type RULES: dict[str, str]
-    :ivar AXIOM: The starting point for the L-system.
+    :ivar AXIOM: The starting string (first stage) of the L-system.
     :type AXIOM: str
     :ivar ROTATION_ANGLE: The rotation angle in degrees for interpreting "+" and "-"
         symbols in the L-system pattern.
     :type ROTATION_ANGLE: int
+    :ivar DRAW_SYMBOLS: Symbols that move the turtle forward and draw a segment.
+    :type DRAW_SYMBOLS: str
+    :ivar TURN_SYMBOLS: Heading change of every turning symbol, in multiples of
+        ROTATION_ANGLE.
+    :type TURN_SYMBOLS: dict[str, int]
+    """
+    RULES: dict[str, str] = {}
+    AXIOM = ''
+    ROTATION_ANGLE = 90
+    DRAW_SYMBOLS = 'F'
+    TURN_SYMBOLS = {'+': 1, '-': -1}
+
+    @classmethod
+    def translation_table(cls, rules: dict[str, str] = None) -> dict[int, str]:
+        """Builds the ``str.translate`` table for the given (or the class) rules."""
+        return str.maketrans(rules or cls.RULES)
+
+    @classmethod
+    def generate_pattern(cls, current_stage: str = None, stages_count: int = 5, rules: dict[str, str] = None) -> str:
+        """Generates the L-system pattern for the specified number of stages."""
+        current_stage = current_stage or cls.AXIOM
+        table = cls.translation_table(rules)
+        for _ in range(stages_count - 1):  # -1 because the axiom is the first stage
+            current_stage = current_stage.translate(table)
+        return current_stage
+
+    @classmethod
+    def iter_pattern(cls, stages_count: int = 5, chunk_size: int = 4096) -> Iterator[str]:
+        """
+        Yields the pattern of the given stage depth-first, in pieces of roughly
+        ``chunk_size`` symbols, without ever building the full string.
+
+        Subtrees small enough to fit in a chunk are expanded once up front and
+        reused, so only the top levels of the derivation are walked in Python.
+        """
+        depth = stages_count - 1
+        table = cls.translation_table()
+        leaves = {symbol: symbol for symbol in cls.RULES}
+        leaf_depth = 0
+        while leaf_depth < depth:
+            expanded = {symbol: leaf.translate(table) for symbol, leaf in leaves.items()}
+            if max(map(len, expanded.values()), default=0) > chunk_size:
+                break
+            leaves = expanded
+            leaf_depth += 1
+
+        pending, pending_size = [], 0
+        stack = [(iter(cls.AXIOM), depth - leaf_depth)]
+        while stack:
+            symbols, remaining = stack[-1]
+            symbol = next(symbols, None)
+            if symbol is None:
+                stack.pop()
+            elif remaining and symbol in cls.RULES:
+                stack.append((iter(cls.RULES[symbol]), remaining - 1))
+            else:
+                piece = leaves.get(symbol, symbol)
+                pending.append(piece)
+                pending_size += len(piece)
+                if pending_size >= chunk_size:
+                    yield ''.join(pending)
+                    pending, pending_size = [], 0
+        if pending:
+            yield ''.join(pending)
+
+    @classmethod
+    @lru_cache
+    def subtree_tables(cls, depth: int) -> tuple[list[dict[str, int]], list[dict[str, int]], list[dict[str, complex]]]:
+        """
+        Summarises the expansion of every symbol at each depth ``0..depth``.
+
+        :return: Per depth, the number of segments drawn by each symbol's subtree,
+            its net heading change (in ROTATION_ANGLE turns) and its net displacement
+            as a complex number, for a turtle starting at 0 heading along 1+0j.
+        """
+        angle = math.radians(cls.ROTATION_ANGLE)
+        alphabet = set(cls.AXIOM) | set(cls.RULES) | set(''.join(cls.RULES.values()))
+        counts = [{symbol: int(symbol in cls.DRAW_SYMBOLS) for symbol in alphabet}]
+        turns = [{symbol: cls.TURN_SYMBOLS.get(symbol, 0) for symbol in alphabet}]
+        shifts = [{symbol: complex(symbol in cls.DRAW_SYMBOLS) for symbol in alphabet}]
+        for _ in range(depth):
+            count, turn, shift = dict(counts[-1]), dict(turns[-1]), dict(shifts[-1])
+            for symbol, rule in cls.RULES.items():
+                count[symbol], turn[symbol], shift[symbol] = 0, 0, 0j
+                for child in rule:
+                    count[symbol] += counts[-1][child]
+                    shift[symbol] += cmath.rect(1, angle * turn[symbol]) * shifts[-1][child]
+                    turn[symbol] += turns[-1][child]
+            counts.append(count)
+            turns.append(turn)
+            shifts.append(shift)
+        return counts, turns, shifts
+
+    @classmethod
+    @lru_cache
+    def subtree_bounds(cls, depth: int) -> list[dict[str, np.ndarray]]:
+        """
+        Precomputes the bounding box of every symbol's subtree at each depth
+        ``0..depth``, for each of the headings the turtle can take.
+
+        :return: Per depth, a ``(headings, 4)`` array of ``(x_min, y_min, x_max, y_max)``
+            boxes per symbol, for a turtle starting at 0 with unit steps along 1+0j.
+        """
+        turns_per_circle = 360 / cls.ROTATION_ANGLE
+        if not turns_per_circle.is_integer():
+            raise ValueError('Subtree bounds need a rotation angle that divides 360 degrees.')
+        headings = np.arange(int(turns_per_circle))
+        rotations = np.exp(1j * np.radians(headings * cls.ROTATION_ANGLE))
+        counts, turns, shifts = cls.subtree_tables(depth)
+
+        empty = np.tile([np.inf, np.inf, -np.inf, -np.inf], (len(headings), 1))
+        bounds = [{symbol: empty for symbol in counts[0]}]
+        for symbol in set(cls.DRAW_SYMBOLS) & set(counts[0]):
+            bounds[0][symbol] = np.stack((
+                np.minimum(rotations.real, 0), np.minimum(rotations.imag, 0),
+                np.maximum(rotations.real, 0), np.maximum(rotations.imag, 0),
+            ), axis=1)
+        for level in range(1, depth + 1):
+            previous = bounds[-1]
+            current = dict(previous)
+            for symbol, rule in cls.RULES.items():
+                box = empty.copy()
+                offset = np.zeros(len(headings), dtype=complex)
+                heading = headings.copy()
+                for child in rule:
+                    child_box = previous[child][heading % len(headings)]
+                    box[:, :2] = np.minimum(box[:, :2], child_box[:, :2] + np.stack((offset.real, offset.imag), axis=1))
+                    box[:, 2:] = np.maximum(box[:, 2:], child_box[:, 2:] + np.stack((offset.real, offset.imag), axis=1))
+                    offset += rotations[heading % len(headings)] * shifts[level - 1][child]
+                    heading += turns[level - 1][child]
+                current[symbol] = box
+            bounds.append(current)
+        return bounds
+
+    @classmethod
+    def segment_count(cls, stages_count: int = 5) -> int:
+        """Returns the number of segments the given stage draws, without expanding it."""
+        counts, _, _ = cls.subtree_tables(stages_count - 1)
+        return sum(counts[-1][symbol] for symbol in cls.AXIOM)
+
+    @classmethod
+    def seek(cls, start: int, stop: int, stages_count: int = 5, start_point=(0, 0),
+             direction=(1, 0)) -> tuple[complex, int, str]:
+        """
+        Walks the derivation tree down to segment ``start`` using
+        :meth:`subtree_tables`, skipping every subtree that lies entirely before it
+        (each segment index is a digit path through the rules, base 7 for Gosper).
+        ``start`` and ``stop`` are interpreted like slice bounds, so negative values
+        count from the end of the curve and values past it are clipped.
+
+        :return: The turtle position (as a complex number) and heading right before
+            the ``start`` segment, and the pattern that draws segments ``[start, stop)``.
+        """
+        depth = stages_count - 1
+        counts, turns, shifts = cls.subtree_tables(depth)
+        start, stop, _ = slice(start, stop).indices(cls.segment_count(stages_count))
+        angle = math.radians(cls.ROTATION_ANGLE)
+        position = complex(*start_point[:2])
+        direction = complex(*direction[:2])
+        heading, pieces = 0, []
+        skip, emit = start, stop - start
+        stack = [(iter(cls.AXIOM), depth)]
+        while stack and emit > 0:
+            symbols, level = stack[-1]
+            symbol = next(symbols, None)
+            if symbol is None:
+                stack.pop()
+                continue
+            size = counts[level][symbol]
+            if skip and size <= skip:
+                skip -= size
+                position += direction * cmath.rect(1, angle * heading) * shifts[level][symbol]
+                heading += turns[level][symbol]
+            elif not skip and size <= emit:
+                pieces.append(cls.generate_pattern(symbol, level + 1))
+                emit -= size
+            else:
+                stack.append((iter(cls.RULES[symbol]), level - 1))
+        return position, heading, ''.join(pieces)
+
+    @classmethod
+    def segment_slice(cls, start: int, stop: int, stages_count: int = 5, start_point=(0, 0), direction=(1, 0),
+                      dimensions: int = 2) -> np.ndarray:
+        """
+        Returns segments ``[start, stop)`` of the given stage without expanding the
+        rest of the curve, so the cost grows with the slice length plus the number
+        of stages. Matches :meth:`generate_lines` up to floating-point rounding.
+        """
+        position, heading, pattern = cls.seek(start, stop, stages_count, start_point, direction)
+        lines, _, _ = cls.interpret(pattern, (position.real, position.imag), direction, heading, dimensions)
+        return lines
+
+    @classmethod
+    def iter_visible_lines(cls, viewport: tuple[float, float, float, float], stages_count: int = 5, start_point=(0, 0),
+                           direction=(1, 0), dimensions: int = 2, margin: float = 0.0) -> Iterator[np.ndarray]:
+        """
+        Streams only the segments whose bounding box meets ``viewport``, given as
+        ``(x_min, y_min, x_max, y_max)`` and grown by ``margin`` on every side.
+
+        The derivation is walked top-down with :meth:`subtree_bounds`: subtrees
+        outside the viewport are skipped whole, subtrees fully inside it are emitted
+        whole, and only those crossing its border are opened further. Each yielded
+        array is a contiguous run of visible segments.
+        """
+        depth = stages_count - 1
+        counts, turns, shifts = cls.subtree_tables(depth)
+        bounds = cls.subtree_bounds(depth)
+        turns_per_circle = int(360 / cls.ROTATION_ANGLE)
+        rotations = np.exp(1j * np.radians(np.arange(turns_per_circle) * cls.ROTATION_ANGLE))
+        x_min, y_min, x_max, y_max = np.asarray(viewport, dtype=float) + (-margin, -margin, margin, margin)
+
+        position = complex(*start_point[:2])
+        scale = complex(*direction[:2])
+        heading, run, run_state = 0, [], None
+        stack = [(iter(cls.AXIOM), depth)]
+        while stack:
+            symbols, level = stack[-1]
+            symbol = next(symbols, None)
+            if symbol is None:
+                stack.pop()
+                continue
+            if counts[level][symbol]:
+                step = scale * rotations[heading % turns_per_circle] * shifts[level][symbol]
+                if level:
+                    box = bounds[level][symbol][heading % turns_per_circle]
+                    corners = position + scale * (box[[0, 2, 2, 0]] + 1j * box[[1, 1, 3, 3]])
+                else:
+                    corners = np.array([position, position + step])
+                left, right = corners.real.min(), corners.real.max()
+                bottom, top = corners.imag.min(), corners.imag.max()
+                if right < x_min or left > x_max or top < y_min or bottom > y_max:
+                    if run:
+                        yield cls.interpret(''.join(run), *run_state, dimensions)[0]
+                        run = []
+                elif level and not (x_min <= left and right <= x_max and y_min <= bottom and top <= y_max):
+                    stack.append((iter(cls.RULES[symbol]), level - 1))
+                    continue
+                else:
+                    if not run:
+                        run_state = ((position.real, position.imag), direction, heading)
+                    run.append(cls.generate_pattern(symbol, level + 1))
+                position += step
+            elif run:
+                run.append(symbol)
+            heading += turns[level][symbol]
+        if run:
+            yield cls.interpret(''.join(run), *run_state, dimensions)[0]
+
+    @classmethod
+    def generate_visible_lines(cls, viewport: tuple[float, float, float, float], stages_count: int = 5,
+                               start_point=(0, 0), direction=(1, 0), dimensions: int = 2,
+                               margin: float = 0.0) -> np.ndarray:
+        """Collects :meth:`iter_visible_lines` into one ``(N, 2, dimensions)`` array."""
+        chunks = list(cls.iter_visible_lines(viewport, stages_count, start_point, direction, dimensions, margin))
+        return np.concatenate(chunks) if chunks else np.empty((0, 2, dimensions))
+
+    @classmethod
+    def cached_lines(cls, stages_count: int = 5, start_point=(0, 0), direction=(1, 0), dimensions: int = 2,
+                     viewport: tuple[float, float, float, float] = None, cache_dir: str = None) -> np.ndarray:
+        """
+        Returns the segments of the given stage (culled to ``viewport`` when one is
+        given) from the on-disk geometry cache, generating them on a miss. The cache
+        key covers every parameter that shapes the output, and the result is a
+        read-only memory map shared between processes.
+        """
+        key = cache_key(
+            kind='lsystem_lines', rules=cls.RULES, axiom=cls.AXIOM, angle=cls.ROTATION_ANGLE,
+            draw_symbols=cls.DRAW_SYMBOLS, turn_symbols=cls.TURN_SYMBOLS, stages_count=stages_count,
+            start_point=start_point, direction=direction, dimensions=dimensions, viewport=viewport
+        )
+
+        def build():
+            if viewport is None:
+                pattern = cls.generate_pattern(stages_count=stages_count)
+                return cls.generate_lines(pattern, start_point, direction, dimensions)
+            return cls.generate_visible_lines(viewport, stages_count, start_point, direction, dimensions)
+
+        return cached_array(key, build, cache_dir)
+
+    @classmethod
+    def locate_segment(cls, index: int, stages_count: int = 5, start_point=(0, 0),
+                       direction=(1, 0)) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the start position and direction vector of segment ``index`` in
+        O(stages). Negative indices count from the end of the curve.
+        """
+        count = cls.segment_count(stages_count)
+        if not -count <= index < count:
+            raise IndexError(f'segment index {index} out of range for {count} segments')
+        index %= count
+        lines = cls.segment_slice(index, index + 1, stages_count, start_point, direction)
+        return lines[0, 0], lines[0, 1] - lines[0, 0]
+
+    @classmethod
+    @lru_cache
+    def symbol_tables(cls) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns byte-indexed lookup tables mapping every symbol to its heading
+        change (in multiples of ROTATION_ANGLE) and to whether it draws a segment.
+        """
+        turns = np.zeros(256, dtype=np.int8)
+        for symbol, turn in cls.TURN_SYMBOLS.items():
+            turns[ord(symbol)] = turn
+        draws = np.zeros(256, dtype=bool)
+        draws[[ord(symbol) for symbol in cls.DRAW_SYMBOLS]] = True
+        return turns, draws
+
+    @classmethod
+    def heading_vectors(cls, headings: np.ndarray, direction=(1, 0)) -> np.ndarray:
+        """
+        Converts integer headings (counted in ROTATION_ANGLE turns from ``direction``)
+        into 2D step vectors. When the angle divides the full turn, the steps come
+        from a small lookup table instead of per-step trigonometry.
+        """
+        headings = np.asarray(headings)
+        direction = np.asarray(direction, dtype=float)[:2]
+        turns_per_circle = 360 / cls.ROTATION_ANGLE
+        if turns_per_circle.is_integer():
+            headings = headings % int(turns_per_circle)
+            angles = np.radians(np.arange(int(turns_per_circle)) * cls.ROTATION_ANGLE)
+        else:
+            angles = np.radians(headings * cls.ROTATION_ANGLE)
+        cos_theta, sin_theta = np.cos(angles), np.sin(angles)
+        vectors = np.stack((
+            direction[0] * cos_theta - direction[1] * sin_theta,
+            direction[0] * sin_theta + direction[1] * cos_theta,
+        ), axis=-1)
+        return vectors[headings] if turns_per_circle.is_integer() else vectors
+
+    @classmethod
+    def interpret(cls, pattern: str, start_point=(0, 0), direction=(1, 0), start_heading: int = 0,
+                  dimensions: int = 2) -> tuple[np.ndarray, np.ndarray, int]:
+        """
+        Vectorized turtle interpretation of ``pattern``.
+
+        Headings are a cumulative sum of the turn indices and positions a cumulative
+        sum of the matching step vectors, so no Python code runs per symbol.
+
+        :return: The ``(N, 2, dimensions)`` segment array, the final turtle position
+            and the final heading, which let a caller continue with the next piece.
+        """
+        turns, draws = cls.symbol_tables()
+        codes = np.frombuffer(pattern.encode('ascii'), dtype=np.uint8)
+        headings = np.cumsum(turns[codes], dtype=np.int64)
+        headings += start_heading
+        steps = cls.heading_vectors(headings[draws[codes]], direction)
+        lines, end_point = trace_steps(steps, start_point, dimensions)
+        end_heading = int(headings[-1]) if len(headings) else start_heading
+        return lines, end_point, end_heading
+
+    @classmethod
+    def generate_lines(cls, pattern: str = None, start_point=(0, 0), direction=(1, 0),
+                       dimensions: int = 2) -> np.ndarray:
+        """
+        Converts the pattern into line segments, returned as one contiguous
+        ``(N, 2, dimensions)`` array of (start, end) points. Pass ``dimensions=3``
+        to get points that can be handed to manim directly.
+        """
+        if pattern is None:
+            pattern = cls.generate_pattern()
+        lines, _, _ = cls.interpret(pattern, start_point, direction, dimensions=dimensions)
+        return lines
+
+    @classmethod
+    def generate_lines_parallel(cls, stages_count: int = 5, start_point=(0, 0), direction=(1, 0),
+                                dimensions: int = 2, workers: int = None, chunks_per_worker: int = 4) -> np.ndarray:
+        """
+        Generates the segments of the given stage on a process pool.
+
+        The first stages are expanded here until there are enough top-level symbols
+        to split into chunks. The heading each chunk starts with is a prefix scan of
+        the chunks' net heading changes, read from :meth:`subtree_tables`, so the
+        workers expand and turn-count their chunks independently. The positions are
+        then one cumulative sum over the stitched steps, exactly as in
+        :meth:`interpret`, so the result is bit-identical to :meth:`generate_lines`
+        and cached geometry stays valid whichever path produced it.
+        """
+        workers = workers or os.cpu_count() or 1
+        depth = stages_count - 1
+        split_depth = 0
+        top = cls.AXIOM
+        while split_depth < depth and len(top) < workers * chunks_per_worker:
+            top = top.translate(cls.translation_table())
+            split_depth += 1
+        remaining = depth - split_depth
+
+        chunk_size = -(-len(top) // (workers * chunks_per_worker))
+        pieces = [top[i:i + chunk_size] for i in range(0, len(top), chunk_size)]
+        _, turns, _ = cls.subtree_tables(remaining)
+        net_turns = [sum(turns[remaining][symbol] for symbol in piece) for piece in pieces]
+        start_headings = np.cumsum([0] + net_turns[:-1]).tolist()
+
+        turns_per_circle = 360 / cls.ROTATION_ANGLE
+        modulus = int(turns_per_circle) if turns_per_circle.is_integer() else None
+        turn_table, draw_table = cls.symbol_tables()
+        arguments = [(piece, cls.RULES, remaining, turn_table, draw_table, heading, modulus)
+                     for piece, heading in zip(pieces, start_headings)]
+        if workers == 1:
+            headings = [_expand_headings(*argument) for argument in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                headings = list(executor.map(_expand_headings, *zip(*arguments)))
+
+        steps = cls.heading_vectors(np.concatenate(headings), direction)
+        lines, _ = trace_steps(steps, start_point, dimensions)
+        return lines
+
+    @classmethod
+    def subtree_block(cls, symbol: str, depth: int, memo: dict = None) -> np.ndarray:
+        """
+        Returns the vertices visited after each segment drawn by ``symbol`` expanded
+        ``depth`` times, as a complex array in canonical orientation (starting at 0,
+        heading along 1+0j with unit steps).
+
+        Each block is computed once per ``memo``, a dict keyed by ``(symbol, depth)``;
+        deeper blocks are assembled from the memoized blocks of the rule's symbols by
+        :meth:`assemble_blocks`. The memo belongs to the caller, so the blocks, which
+        reach about 92 MB each at depth 8, are freed with it.
+        """
+        if memo is None:
+            memo = {}
+        key = symbol, depth
+        if key not in memo:
+            if depth == 0 or symbol not in cls.RULES:
+                block = np.ones(1, dtype=complex) if symbol in cls.DRAW_SYMBOLS else np.zeros(0, dtype=complex)
+            else:
+                block = cls.assemble_blocks(cls.RULES[symbol], depth - 1, memo)
+            memo[key] = block
+        return memo[key]
+
+    @classmethod
+    def assemble_blocks(cls, symbols: str, depth: int, memo: dict = None) -> np.ndarray:
+        """
+        Places the memoized ``depth`` blocks of ``symbols`` one after another. Every
+        block is rotated and translated with one batched complex multiply-add, so
+        the Python work is per symbol of ``symbols``, not per segment.
+        """
+        if memo is None:
+            memo = {}
+        _, turns, shifts = cls.subtree_tables(depth)
+        angle = math.radians(cls.ROTATION_ANGLE)
+        blocks, offset, heading = [], 0j, 0
+        for symbol in symbols:
+            rotation = cmath.rect(1, angle * heading)
+            block = cls.subtree_block(symbol, depth, memo)
+            if len(block):
+                blocks.append(block * rotation + offset)
+            offset += rotation * shifts[depth][symbol]
+            heading += turns[depth][symbol]
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=complex)
+
+    @classmethod
+    def generate_lines_instanced(cls, stages_count: int = 5, start_point=(0, 0), direction=(1, 0),
+                                 dimensions: int = 2) -> np.ndarray:
+        """
+        Generates the segments of the given stage from memoized subtree blocks
+        (see :meth:`subtree_block`) instead of walking every symbol. Matches
+        :meth:`generate_lines` up to floating-point rounding. The memo only lives
+        for this call.
+        """
+        vertices = cls.assemble_blocks(cls.AXIOM, stages_count - 1, {})
+        points = np.zeros((len(vertices) + 1, dimensions))
+        points[:, 0], points[:, 1] = start_point[0], start_point[1]
+        if len(start_point) > 2 and dimensions > 2:
+            points[:, 2] = start_point[2]
+        vertices = vertices * complex(*direction[:2])
+        points[1:, 0] += vertices.real
+        points[1:, 1] += vertices.imag
+        return np.stack((points[:-1], points[1:]), axis=1)
+
+    @classmethod
+    def generate_lattice_lines(cls, pattern: str = None) -> np.ndarray:
+        """
+        Interprets the pattern with exact integer arithmetic on the hexagonal
+        (Eisenstein integer) lattice, for systems whose angle is a multiple of 60°.
+
+        The turtle starts at the lattice origin heading along 1, so no rounding
+        error builds up over many turns and equal points compare equal. Use
+        :func:`lattice_to_points` to place the result in the scene.
+
+        :return: An ``(N, 2, 2)`` int64 array of (a, b) endpoint coefficients.
+        """
+        if cls.ROTATION_ANGLE % 60:
+            raise ValueError('The lattice mode needs a rotation angle that is a multiple of 60 degrees.')
+        if pattern is None:
+            pattern = cls.generate_pattern()
+        turns, draws = cls.symbol_tables()
+        codes = np.frombuffer(pattern.encode('ascii'), dtype=np.uint8)
+        headings = np.cumsum(turns[codes], dtype=np.int64) * (cls.ROTATION_ANGLE // 60)
+        points = np.zeros((np.count_nonzero(draws[codes]) + 1, 2), dtype=np.int64)
+        points[1:] = EISENSTEIN_STEPS[headings[draws[codes]] % len(EISENSTEIN_STEPS)]
+        np.cumsum(points, axis=0, out=points)
+        return np.stack((points[:-1], points[1:]), axis=1)
+
+    @classmethod
+    def iter_lines(cls, stages_count: int = 5, start_point=(0, 0), direction=(1, 0), chunk_size: int = 4096,
+                   dimensions: int = 2) -> Iterator[np.ndarray]:
+        """
+        Streams the segments of the given stage as ``(chunk_size, 2, dimensions)``
+        arrays (the last one may be shorter). The pattern is expanded depth-first
+        and interpreted piece by piece, carrying the turtle state between pieces,
+        so memory use stays flat however deep the stage is. The concatenated chunks
+        are identical to :meth:`generate_lines` for the same stage.
+        """
+        position, heading = start_point, 0
+        buffer, filled = np.empty((chunk_size, 2, dimensions)), 0
+        for piece in cls.iter_pattern(stages_count, chunk_size):
+            lines, position, heading = cls.interpret(piece, position, direction, heading, dimensions)
+            while len(lines):
+                taken = min(chunk_size - filled, len(lines))
+                buffer[filled:filled + taken] = lines[:taken]
+                filled += taken
+                lines = lines[taken:]
+                if filled == chunk_size:
+                    yield buffer
+                    buffer, filled = np.empty((chunk_size, 2, dimensions)), 0
+        if filled:
+            yield buffer[:filled]
+
+
+class GosperCurve(LSystem):
+    """
+    Represents the Gosper curve (also known as the Peano-Gosper curve or flowsnake)
+    in the context of L-systems.
+
+    The Gosper curve is a space-filling curve that can be generated iteratively using
+    L-system (Lindenmayer system) rules. This class is a preset of :class:`LSystem`
+    and provides functionalities to generate the pattern for a specified number of
+    stages, and convert that pattern into a corresponding list of line segments based
+    on a starting point and direction.
     """
     RULES = {
         'A': 'A-B--B+A++AA+B-',
@@ -26,36 +569,164 @@ class GosperCurve:
     }
     AXIOM = 'A'
     ROTATION_ANGLE = 60  # Extracted constant for rotation angle in degrees
+    DRAW_SYMBOLS = 'AB'
 
-    @staticmethod
-    def generate_pattern(current_stage: str = None, stages_count: int = 5, rules: dict[str, str] = None) -> str:
-        """Generates the L-system pattern for the specified number of stages."""
-        current_stage = current_stage or GosperCurve.AXIOM
-        rules = rules or GosperCurve.RULES
-        for _ in range(stages_count - 1):  # -1 because the axiom is the first stage
-            next_stage = ''
-            for char in current_stage:
-                next_stage += rules.get(char, char)
-            current_stage = next_stage
-        return current_stage
+
+class CompactionReport(NamedTuple):
+    """
+    Summary of :func:`compact_lines`: how many stroke primitives were left.
+
+    :ivar segments: Number of input segments.
+    :ivar polylines: Number of chained polylines.
+    :ivar strokes: Number of straight strokes left after merging collinear runs.
+    """
+    segments: int
+    polylines: int
+    strokes: int
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the input segments removed by merging, from 0 to 1."""
+        return 1 - self.strokes / self.segments if self.segments else 0.0
+
+
+def compact_lines(lines: np.ndarray, tolerance: float = 1e-9) -> tuple[list[np.ndarray], CompactionReport]:
+    """
+    Chains contiguous segments into polylines and merges consecutive collinear
+    segments that point the same way into single strokes.
+
+    :param lines: An ``(N, 2, dimensions)`` segment array, as from :meth:`LSystem.generate_lines`.
+    :param tolerance: Largest endpoint gap still treated as contiguous, and largest
+        relative cross product still treated as collinear.
+    :return: The polylines as ``(vertices, dimensions)`` arrays, and a report of the
+        achieved reduction.
+    """
+    lines = np.asarray(lines, dtype=float)
+    if not len(lines):
+        return [], CompactionReport(0, 0, 0)
+    steps = lines[:, 1] - lines[:, 0]
+    gaps = np.linalg.norm(lines[1:, 0] - lines[:-1, 1], axis=1)
+    cross = steps[:-1, 0] * steps[1:, 1] - steps[:-1, 1] * steps[1:, 0]
+    lengths = np.linalg.norm(steps, axis=1)
+    collinear = (np.abs(cross) <= tolerance * lengths[:-1] * lengths[1:]) & (np.sum(steps[:-1] * steps[1:], axis=1) > 0)
+
+    breaks = np.ones(len(lines), dtype=bool)
+    breaks[1:] = gaps > tolerance
+    vertices = breaks.copy()
+    vertices[1:] |= ~collinear
+
+    starts = np.flatnonzero(breaks)
+    ends = np.append(starts[1:], len(lines)) - 1
+    kept = np.flatnonzero(vertices)
+    groups = np.split(kept, np.searchsorted(kept, starts[1:]))
+    polylines = [np.vstack((lines[group, 0], lines[end, 1])) for group, end in zip(groups, ends)]
+    return polylines, CompactionReport(len(lines), len(polylines), len(kept))
+
+
+def trace_steps(steps: np.ndarray, start_point=(0, 0), dimensions: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Walks the 2D ``steps`` from ``start_point`` with a single cumulative sum.
+
+    :return: The ``(N, 2, dimensions)`` segment array and the end point.
+    """
+    points = np.zeros((len(steps) + 1, dimensions))
+    start_point = np.asarray(start_point, dtype=float)[:dimensions]
+    points[0, :len(start_point)] = start_point
+    points[1:, :2] = steps
+    np.cumsum(points, axis=0, out=points)
+    return np.stack((points[:-1], points[1:]), axis=1), points[-1]
+
+
+def _expand_headings(piece: str, rules: dict[str, str], depth: int, turn_table: np.ndarray, draw_table: np.ndarray,
+                     start_heading: int, modulus: int = None) -> np.ndarray:
+    """
+    Process pool worker of :meth:`LSystem.generate_lines_parallel`: expands one
+    chunk ``depth`` times and returns the heading of each segment it draws,
+    reduced modulo ``modulus`` (into a compact int8 array) when there is one.
+    """
+    table = str.maketrans(rules)
+    for _ in range(depth):
+        piece = piece.translate(table)
+    codes = np.frombuffer(piece.encode('ascii'), dtype=np.uint8)
+    headings = np.cumsum(turn_table[codes], dtype=np.int64)
+    headings += start_heading
+    headings = headings[draw_table[codes]]
+    if modulus is not None and modulus <= 127:
+        return (headings % modulus).astype(np.int8)
+    return headings
+
+
+def lattice_to_points(lattice: np.ndarray, start_point=(0, 0), direction=(1, 0), dimensions: int = 2) -> np.ndarray:
+    """
+    Converts Eisenstein lattice coefficients to float coordinates: the lattice step
+    1 becomes ``direction`` and the lattice origin becomes ``start_point``. This is
+    the only place where rounding happens in the lattice mode.
+    """
+    lattice = np.asarray(lattice)
+    z = lattice[..., 0] + lattice[..., 1] * EISENSTEIN_OMEGA
+    z = complex(*start_point[:2]) + complex(*direction[:2]) * z
+    points = np.zeros(lattice.shape[:-1] + (dimensions,))
+    points[..., 0] = z.real
+    points[..., 1] = z.imag
+    return points
+
+
+class LatticeSegmentIndex:
+    """
+    Sorted index of lattice segments, for removing duplicate strokes and finding
+    segments that meet at a vertex.
+
+    Every segment is keyed by its unordered pair of endpoints packed into integers,
+    so the two directions of one stroke share a key. On the unit lattice two
+    segments overlap exactly when they share that key, so deduplication removes
+    overlapping strokes too. Duplicates are found by sorting the keys
+    (``np.unique``), and vertex lookups binary-search the sorted endpoint keys
+    (``np.searchsorted``), in O(log N) per query.
+    """
+
+    def __init__(self, lattice_lines: np.ndarray):
+        """
+        Builds the index.
+
+        Parameters:
+        - lattice_lines: An ``(N, 2, 2)`` integer array, as from
+          :meth:`LSystem.generate_lattice_lines`.
+        """
+        lattice_lines = np.asarray(lattice_lines, dtype=np.int64)
+        keys = self.vertex_keys(lattice_lines)
+        keys.sort(axis=1)
+        _, first, self.inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        order = np.argsort(first)  # Keep unique segments in drawing order
+        self.lines = lattice_lines[first[order]]
+        self.inverse = np.argsort(order)[self.inverse.ravel()]
+        self.keys = keys[first[order]]
+
+        endpoint_keys = self.keys.ravel()
+        self._endpoint_order = np.argsort(endpoint_keys, kind='stable')
+        self._sorted_endpoint_keys = endpoint_keys[self._endpoint_order]
 
     @staticmethod
-    def generate_lines(pattern: str = None, start_point=(0, 0), direction=(1, 0)) -> list[tuple[np.ndarray, np.ndarray]]:
-        if pattern is None:
-            pattern = GosperCurve.generate_pattern()
-        current_position = np.array(start_point)
-        direction = np.array(direction)
-        lines = []
-        for char in pattern:
-            if char in ['A', 'B']:
-                new_position = current_position + direction
-                lines.append((current_position, new_position))
-                current_position = new_position
-            elif char == '-':
-                direction = rotate_vector(direction, -GosperCurve.ROTATION_ANGLE)
-            elif char == '+':
-                direction = rotate_vector(direction, GosperCurve.ROTATION_ANGLE)
-        return lines
+    def vertex_keys(vertices: np.ndarray) -> np.ndarray:
+        """Packs (a, b) lattice coefficients into single int64 keys."""
+        vertices = np.asarray(vertices, dtype=np.int64)
+        return (vertices[..., 0] << 32) + (vertices[..., 1] + (1 << 31))
+
+    @property
+    def duplicates(self) -> int:
+        """Number of input segments that repeated an earlier stroke."""
+        return len(self.inverse) - len(self.lines)
+
+    def neighbours(self, vertex) -> np.ndarray:
+        """Returns the indices (into :attr:`lines`) of the unique segments ending at ``vertex``."""
+        key = self.vertex_keys(vertex)
+        start = np.searchsorted(self._sorted_endpoint_keys, key, side='left')
+        stop = np.searchsorted(self._sorted_endpoint_keys, key, side='right')
+        return self._endpoint_order[start:stop] // 2
+
+    def adjacent(self, index: int) -> np.ndarray:
+        """Returns the indices of the unique segments sharing an endpoint with segment ``index``."""
+        touching = np.concatenate([self.neighbours(vertex) for vertex in self.lines[index]])
+        return np.unique(touching[touching != index])
 
 
 def rotate_vector(vector: tuple[float, float], angle_degrees: float) -> tuple[float, float]:
@@ -0,0 +1,50 @@
+from manim import *
+from Lsystem import GosperCurve, compact_lines
+from polyline import straight_curves
+
+
+def frame_viewport() -> tuple[float, float, float, float]:
+    """
+    Returns the camera frame as an ``(x_min, y_min, x_max, y_max)`` rectangle.
+    """
+    return -config.frame_x_radius, -config.frame_y_radius, config.frame_x_radius, config.frame_y_radius
+
+
+class GosperBackground(VMobject):
+    """
+    The Gosper Curve drawn in the background of the scenes, built as a single
+    VMobject instead of one Line per segment.
+
+    The segments come from the geometry cache, culled to the camera frame, and are
+    chained into polylines with collinear runs merged. All Bézier points are then
+    set in one step, so construction and rendering cost depend on the number of
+    points rather than on the number of mobjects.
+    """
+
+    def __init__(self, start_point=(3, 10), direction=(0.4, 0), stages_count=5, color=PURPLE, stroke_width=1,
+                 stroke_opacity=0.5, **kwargs):
+        """
+        Initializes the background curve.
+
+        Parameters:
+        - start_point: Start of the curve in scene coordinates.
+        - direction: First step of the turtle; its length is the segment length.
+        - stages_count: L-system stage to draw.
+        - color, stroke_width, stroke_opacity: Stroke style of the curve.
+        """
+        super().__init__(stroke_color=color, stroke_width=stroke_width, stroke_opacity=stroke_opacity, **kwargs)
+        lines = GosperCurve.cached_lines(stages_count, start_point, direction, dimensions=3,
+                                         viewport=frame_viewport())
+        polylines, self.compaction = compact_lines(lines)
+        self.set_points(self.polyline_points(polylines))
+
+    def polyline_points(self, polylines: list[np.ndarray]) -> np.ndarray:
+        """
+        Converts polylines into the cubic Bézier points of straight curves. Curves of
+        different polylines do not touch, so manim draws them as separate subpaths.
+        """
+        if not polylines:
+            return np.zeros((0, 3))
+        starts = np.concatenate([polyline[:-1] for polyline in polylines])
+        ends = np.concatenate([polyline[1:] for polyline in polylines])
+        return straight_curves(starts, ends, self.n_points_per_cubic_curve).reshape(-1, 3)
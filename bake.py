@@ -0,0 +1,60 @@
+from collections.abc import Callable
+
+from manim import *
+
+from geometry_cache import cache_key, cached_array
+
+BAKE_RATE = 120  # Samples per second of animation; replay interpolates between them, so any frame rate works
+
+
+def bake_samples(run_time: float) -> int:
+    """Returns how many samples a motion of ``run_time`` seconds is baked into."""
+    return max(int(np.ceil(run_time * BAKE_RATE)), 1) + 1
+
+
+def bake(name: str, evaluate: Callable[[np.ndarray], np.ndarray], samples: int, cache_dir: str = None,
+         **parts) -> np.ndarray:
+    """
+    Bakes a motion into a table of points.
+
+    ``evaluate`` gets the progress values ``u`` of all samples at once, evenly
+    spaced over [0, 1], and returns the points of the mobject for each of them as
+    a ``(samples, points, 3)`` array. The table is stored in the geometry cache
+    under ``name`` and ``parts``, which must describe everything the motion
+    depends on, so re-renders load it instead of evaluating it again.
+    """
+    key = cache_key(kind='bake', name=name, samples=samples, **parts)
+    return cached_array(key, lambda: np.asarray(evaluate(np.linspace(0, 1, samples)), dtype=float), cache_dir)
+
+
+class PlayBaked(Animation):
+    """
+    Replays a table from :func:`bake` on a mobject: every frame looks up the two
+    samples around the eased progress and interpolates their points, instead of
+    running updaters that rebuild geometry in Python.
+    """
+
+    def __init__(self, mobject: Mobject, table: np.ndarray, **kwargs):
+        """
+        Initializes the replay.
+
+        Parameters:
+        - mobject: The mobject to move; it needs as many points as a table sample.
+        - table: The ``(samples, points, 3)`` table, with at least two samples.
+        """
+        if len(table) < 2:
+            raise ValueError('A baked table needs at least two samples.')
+        self.table = table
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.buffer = np.array(self.table[0])
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float):
+        position = self.rate_func(alpha) * (len(self.table) - 1)
+        index = min(max(int(position), 0), len(self.table) - 2)
+        np.subtract(self.table[index + 1], self.table[index], out=self.buffer)
+        self.buffer *= position - index
+        self.buffer += self.table[index]
+        self.mobject.points = self.buffer
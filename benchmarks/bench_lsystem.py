@@ -0,0 +1,148 @@
+"""
+Benchmarks Lsystem generation across stages and backends.
+
+Runs without a display and writes machine-readable results, so the effect of a
+change to Lsystem.py can be compared in review:
+
+    python benchmarks/bench_lsystem.py --stages 3 9 --output benchmarks/results.json
+
+Every measurement records the best wall-clock time over ``--repeat`` runs and the
+peak traced memory (tracemalloc) of a separate run.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lsystem import GosperCurve, rotate_vector  # noqa: E402
+
+START_POINT = (3, 10)
+DIRECTION = (0.4, 0)
+VIEWPORT = (-64 / 9, -4, 64 / 9, 4)  # The default 16:9 manim frame
+REFERENCE_MAX_STAGE = 6  # The per-symbol Python turtle gets too slow beyond this
+MOBJECT_MAX_STAGE = 6
+
+
+def reference_lines(pattern):
+    """The original per-symbol Python turtle, kept as the baseline to compare against."""
+    position = np.array(START_POINT, dtype=float)
+    direction = np.array(DIRECTION, dtype=float)
+    lines = []
+    for char in pattern:
+        if char in GosperCurve.DRAW_SYMBOLS:
+            new_position = position + direction
+            lines.append((position, new_position))
+            position = new_position
+        elif char in GosperCurve.TURN_SYMBOLS:
+            direction = rotate_vector(direction, GosperCurve.TURN_SYMBOLS[char] * GosperCurve.ROTATION_ANGLE)
+    return lines
+
+
+def streamed_count(stage):
+    return sum(len(chunk) for chunk in GosperCurve.iter_lines(stage, START_POINT, DIRECTION, chunk_size=65536))
+
+
+def backends(stage, pattern, workers, cache_dir):
+    """Returns the (phase, backend, callable) triples measured for one stage."""
+    cases = [
+        ('expansion', 'translate', lambda: GosperCurve.generate_pattern(stages_count=stage)),
+        ('expansion', 'streaming', lambda: sum(map(len, GosperCurve.iter_pattern(stage, 65536)))),
+        ('interpretation', 'vectorized', lambda: GosperCurve.generate_lines(pattern, START_POINT, DIRECTION)),
+        ('interpretation', 'lattice', lambda: GosperCurve.generate_lattice_lines(pattern)),
+        ('generation', 'streaming', lambda: streamed_count(stage)),
+        ('generation', 'parallel',
+         lambda: GosperCurve.generate_lines_parallel(stage, START_POINT, DIRECTION, workers=workers)),
+        ('generation', 'instanced', lambda: GosperCurve.generate_lines_instanced(stage, START_POINT, DIRECTION)),
+        ('generation', 'culled',
+         lambda: GosperCurve.generate_visible_lines(VIEWPORT, stage, START_POINT, DIRECTION)),
+        ('generation', 'cached',
+         lambda: GosperCurve.cached_lines(stage, START_POINT, DIRECTION, cache_dir=cache_dir)),
+    ]
+    if stage <= REFERENCE_MAX_STAGE:
+        cases.append(('interpretation', 'serial', lambda: reference_lines(pattern)))
+    return cases
+
+
+def mobject_backends(stage):
+    """Returns the mobject construction cases, or nothing when manim is not installed."""
+    try:
+        from manim import Line, VGroup
+        from background import GosperBackground
+    except ImportError:
+        return []
+    lines = GosperCurve.generate_visible_lines(VIEWPORT, stage, START_POINT, DIRECTION, dimensions=3)
+    return [
+        ('mobjects', 'line_group', lambda: VGroup(*[Line(line[0], line[1], stroke_width=1) for line in lines])),
+        ('mobjects', 'single_vmobject', lambda: GosperBackground(START_POINT, DIRECTION, stages_count=stage)),
+    ]
+
+
+def measure(function, repeat):
+    """Returns the best time over ``repeat`` runs and the peak traced memory of one more run."""
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run(stages, repeat, workers):
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for stage in stages:
+            pattern = GosperCurve.generate_pattern(stages_count=stage)
+            cases = backends(stage, pattern, workers, cache_dir)
+            if stage <= MOBJECT_MAX_STAGE:
+                cases += mobject_backends(stage)
+            for phase, backend, function in cases:
+                seconds, peak = measure(function, repeat)
+                results.append({
+                    'stage': stage,
+                    'phase': phase,
+                    'backend': backend,
+                    'segments': 7 ** (stage - 1),
+                    'seconds': seconds,
+                    'peak_bytes': peak,
+                })
+                print(f'stage {stage}  {phase:<15}{backend:<16}{seconds * 1000:>10.2f} ms{peak / 2 ** 20:>10.1f} MiB')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stages', type=int, nargs=2, default=(3, 9), metavar=('FIRST', 'LAST'))
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per measurement (best is kept)')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size of the parallel backend')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results.json'))
+    args = parser.parse_args()
+
+    results = run(range(args.stages[0], args.stages[1] + 1), args.repeat, args.workers)
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+
+import numpy as np
+
+CACHE_DIR = os.environ.get(
+    'PIGROUND_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media', 'geometry_cache')
+)
+CACHE_VERSION = 1  # Bump when generated geometry changes, so stale files are never reused
+
+
+def cache_key(**parts) -> str:
+    """
+    Returns a content address for the given generation parameters. Numbers are
+    normalized to floats, so ``(3, 10)`` and ``np.array([3.0, 10.0])`` map to the
+    same key.
+    """
+    payload = json.dumps(_normalize({'version': CACHE_VERSION, **parts}), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_array(key: str, build: Callable[[], np.ndarray], cache_dir: str = None) -> np.ndarray:
+    """
+    Loads the array stored under ``key`` as a read-only memory map, building and
+    saving it first when it is missing or unreadable.
+
+    Files are written under a temporary name and atomically renamed, so parallel
+    render workers can share one cache directory: the loser of a race simply
+    replaces an identical file, and readers never see a partial one. Memory
+    mapping lets all workers share the same pages instead of holding copies.
+    """
+    path = os.path.join(cache_dir or CACHE_DIR, f'{key}.npy')
+    array = _load(path)
+    if array is None:
+        _save(path, np.ascontiguousarray(build()))
+        array = _load(path)
+    return array
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {str(name): _normalize(item) for name, item in value.items()}
+    if isinstance(value, (tuple, list, np.ndarray)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def _load(path: str):
+    try:
+        return np.load(path, mmap_mode='r')
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError):
+        pass
+    try:
+        return np.load(path)  # Zero-size arrays cannot be memory mapped
+    except (ValueError, OSError):
+        return None
+
+
+def _save(path: str, array: np.ndarray):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.npy.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            np.save(file, array)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
@@ -0,0 +1,136 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from manim import *
+
+GLYPHS = '-0123456789.'
+GLYPH_MARK = r'\rule{1pt}{1pt}'  # Set between the glyphs of the template line to mark where their boxes start and end
+
+
+class GlyphTemplate(NamedTuple):
+    glyph: VMobject  # One path, positioned with its box starting at x = 0 and its baseline at y = 0
+    advance: float
+
+
+@lru_cache(maxsize=None)
+def glyph_templates() -> dict[str, GlyphTemplate]:
+    """
+    Compiles all digits, the minus sign and the decimal point in one MathTex, so a
+    single LaTeX run covers every number, and returns each glyph with its
+    horizontal advance. Every glyph is set in braces, as an ordinary symbol,
+    between two small rules: the right edge of the rule before it is where its box
+    starts and the left edge of the rule after it is where the box ends, so the
+    advance includes the glyph's own side bearings and nothing of its neighbours'.
+    Each glyph is flattened into a single path, so a label can show any glyph by
+    rewriting the points of one VMobject.
+    """
+    parts = [GLYPH_MARK]
+    for char in GLYPHS:
+        parts += ['{' + char + '}', GLYPH_MARK]
+    line = MathTex(*parts, font_size=DEFAULT_FONT_SIZE)
+    marks, chars = line.submobjects[::2], line.submobjects[1::2]
+    baseline = marks[0].get_bottom()[1]
+    templates = {}
+    for char, part, before, after in zip(GLYPHS, chars, marks, marks[1:]):
+        paths = part.family_members_with_points()
+        glyph = VMobject()
+        glyph.set_points(np.vstack([path.points for path in paths]))
+        glyph.match_style(paths[0])
+        origin = before.get_right()[0]
+        glyph.shift(LEFT * origin + DOWN * baseline)
+        templates[char] = GlyphTemplate(glyph, after.get_left()[0] - origin)
+    return templates
+
+
+class GlyphNumber(VGroup):
+    """
+    A number label composed from cached digit glyphs instead of a fresh LaTeX
+    compile per value.
+
+    The glyphs come from :func:`glyph_templates`, typeset once per render. Each
+    character of the label is one glyph path, and :meth:`set_value` rewrites the
+    points of these paths from the templates in place, keeping the label's size,
+    style and the position of ``edge_to_fix``. Paths are only added or removed
+    when the number of characters changes, so a label can show a new value every
+    frame without building mobjects.
+    """
+
+    def __init__(self, value=0, num_decimal_places=2, text=None, font_size=DEFAULT_FONT_SIZE, edge_to_fix=LEFT,
+                 **kwargs):
+        """
+        Initializes the label.
+
+        Parameters:
+        - value: The number to show.
+        - num_decimal_places: Decimals the value is formatted with.
+        - text: A preformatted number (digits, '-' and '.'), shown instead of ``value``.
+        - font_size: Size matching a Tex or MathTex of the same font size.
+        - edge_to_fix: Edge that stays in place when the value changes.
+        """
+        super().__init__(**kwargs)
+        self.num_decimal_places = num_decimal_places
+        self.edge_to_fix = edge_to_fix
+        self.value = value
+        text = text if text is not None else self.format(value)
+        self.add(*(template.glyph.copy() for template in self.get_templates(text)))
+        self.layout(text, 1)
+        self.scale(font_size / DEFAULT_FONT_SIZE, about_point=ORIGIN)
+        self.set_color(self.color)
+
+    def format(self, value) -> str:
+        return f'{value:.{self.num_decimal_places}f}'
+
+    @staticmethod
+    def get_templates(text: str) -> list[GlyphTemplate]:
+        templates = glyph_templates()
+        for char in text:
+            if char not in templates:
+                raise ValueError(f'GlyphNumber cannot show {char!r} in {text!r}, only {GLYPHS!r}.')
+        return [templates[char] for char in text]
+
+    def layout(self, text: str, scale: float):
+        """
+        Writes the glyphs of ``text`` into the glyph paths, one per character, laid
+        out on one baseline from the origin at ``scale`` times the template size.
+        """
+        x = 0.0
+        for glyph, template in zip(self.submobjects, self.get_templates(text)):
+            glyph.set_points(template.glyph.points * scale + RIGHT * (x * scale))
+            x += template.advance
+        self.text = text
+
+    @property
+    def font_size(self) -> float:
+        """The font size the glyphs are currently scaled to."""
+        return DEFAULT_FONT_SIZE * self.glyph_scale()
+
+    @font_size.setter
+    def font_size(self, font_size: float):
+        self.scale(font_size / self.font_size)
+
+    def glyph_scale(self) -> float:
+        """Returns how much the glyphs are scaled relative to the templates."""
+        return self.submobjects[0].height / glyph_templates()[self.text[0]].glyph.height
+
+    def get_value(self):
+        return self.value
+
+    def set_value(self, value):
+        """Shows ``value`` formatted with :attr:`num_decimal_places`."""
+        self.value = value
+        return self.set_text(self.format(value))
+
+    def set_text(self, text: str):
+        """Shows a preformatted number, rewriting the glyph paths in place."""
+        if text == self.text:
+            return self
+        scale = self.glyph_scale()
+        anchor = self.get_critical_point(self.edge_to_fix)
+        if len(text) > len(self.submobjects):
+            # New paths copy the last one, so they share the label's current style.
+            self.add(*(self.submobjects[-1].copy() for _ in range(len(text) - len(self.submobjects))))
+        elif len(text) < len(self.submobjects):
+            self.remove(*self.submobjects[len(text):])
+        self.layout(text, scale)
+        self.shift(anchor - self.get_critical_point(self.edge_to_fix))
+        return self
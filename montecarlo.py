@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+
+SOBOL_BITS = 32
+CONFIDENCE_Z = 1.96  # Standard errors in the 95% confidence interval of every estimate
+
+
+class PiEstimator:
+    """
+    Streaming Monte Carlo estimate of pi from samples of a square with its
+    inscribed circle: pi ≈ 4 * (samples inside the circle) / (all samples).
+
+    Samples are consumed in batches; every update only counts the new batch, so
+    the cost per update is O(batch) no matter how many samples came before. The
+    standard error of the estimate follows from the binomial variance of the hit
+    ratio, which gives a running confidence band.
+    """
+
+    def __init__(self, confidence_z: float = CONFIDENCE_Z, sampler: str = 'uniform'):
+        """
+        Initializes an empty estimator.
+
+        Parameters:
+        - confidence_z: Width of the confidence interval in standard errors
+          (CONFIDENCE_Z for 95%).
+        - sampler: Name of the sampler (see SAMPLERS) that produced the samples,
+          reported alongside the estimate. The standard error assumes independent
+          samples, so for the low-discrepancy samplers it is a conservative bound.
+        """
+        self.confidence_z = confidence_z
+        self.sampler = sampler
+        self.samples = 0
+        self.hits = 0
+        self.history = []  # (samples, estimate, standard error) after every update
+
+    def update(self, inside: np.ndarray) -> 'PiEstimator':
+        """
+        Adds a batch of classified samples.
+
+        Parameters:
+        - inside: Boolean array, true for the samples that fell inside the circle.
+        """
+        inside = np.asarray(inside, dtype=bool)
+        self.samples += inside.size
+        self.hits += int(np.count_nonzero(inside))
+        self.history.append((self.samples, self.estimate, self.standard_error))
+        return self
+
+    def update_points(self, points: np.ndarray, radius: float = 1.0) -> 'PiEstimator':
+        """Classifies a batch of ``(N, 2)`` points against a circle of ``radius`` at the origin and adds it."""
+        points = np.asarray(points, dtype=float)
+        return self.update(np.einsum('ij,ij->i', points[:, :2], points[:, :2]) < radius ** 2)
+
+    @property
+    def estimate(self) -> float:
+        """The current estimate of pi (nan before the first sample)."""
+        return 4 * self.hits / self.samples if self.samples else math.nan
+
+    @property
+    def standard_error(self) -> float:
+        """The standard error of :attr:`estimate`."""
+        if not self.samples:
+            return math.nan
+        ratio = self.hits / self.samples
+        return 4 * math.sqrt(ratio * (1 - ratio) / self.samples)
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        """The confidence interval around :attr:`estimate`."""
+        margin = self.confidence_z * self.standard_error
+        return self.estimate - margin, self.estimate + margin
+
+
+def lattice_samples(count: int, seed: int = None, resolution: int = 78) -> np.ndarray:
+    """
+    Pseudo-random samples snapped to a ``resolution`` x ``resolution`` lattice, as
+    the original PiRatio drew them with ``np.random.randint``.
+    """
+    half = resolution // 2
+    cells = np.random.RandomState(seed).randint(-half, half, size=(count, 2))
+    return (cells + half) / resolution
+
+
+def uniform_samples(count: int, seed: int = None) -> np.ndarray:
+    """Plain pseudo-random samples."""
+    return np.random.default_rng(seed).random((count, 2))
+
+
+def stratified_samples(count: int, seed: int = None) -> np.ndarray:
+    """
+    Jittered samples: the square is split into a grid of at least ``count`` equal
+    strata, ``count`` of them are picked at random, and each gets one uniformly
+    placed sample.
+    """
+    rng = np.random.default_rng(seed)
+    side = math.ceil(math.sqrt(count))
+    cells = rng.permutation(side * side)[:count]
+    return (np.column_stack((cells % side, cells // side)) + rng.random((count, 2))) / side
+
+
+def halton_samples(count: int, seed: int = None, bases: tuple[int, int] = (2, 3)) -> np.ndarray:
+    """
+    The 2D Halton sequence (radical inverses in ``bases``), skipping its first
+    point at the origin. With a seed the sequence gets a random toroidal shift
+    (Cranley-Patterson rotation), which keeps its low discrepancy.
+    """
+    index = np.arange(1, count + 1)
+    samples = np.column_stack([_radical_inverse(index, base) for base in bases])
+    if seed is not None:
+        samples = (samples + np.random.default_rng(seed).random(2)) % 1
+    return samples
+
+
+def sobol_samples(count: int, seed: int = None) -> np.ndarray:
+    """
+    The first two dimensions of the Sobol sequence, skipping its first point at
+    the origin. With a seed the points get a random digital shift (XOR), which
+    keeps their low discrepancy.
+    """
+    index = np.arange(1, count + 1, dtype=np.uint64)
+    bits = np.arange(1, SOBOL_BITS + 1, dtype=np.uint64)
+    first = np.uint64(1) << (np.uint64(SOBOL_BITS) - bits)  # Van der Corput in base 2
+    second = np.empty_like(first)  # Primitive polynomial x + 1, m_1 = 1
+    second[0] = first[0]
+    for bit in range(1, SOBOL_BITS):
+        second[bit] = second[bit - 1] ^ (second[bit - 1] >> np.uint64(1))
+
+    samples = np.zeros((count, 2), dtype=np.uint64)
+    for bit in range(SOBOL_BITS):
+        selected = ((index >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+        samples[selected, 0] ^= first[bit]
+        samples[selected, 1] ^= second[bit]
+    if seed is not None:
+        samples ^= np.random.default_rng(seed).integers(0, 2 ** SOBOL_BITS, size=2, dtype=np.uint64)
+    return samples / float(2 ** SOBOL_BITS)
+
+
+SAMPLERS = {
+    'lattice': lattice_samples,
+    'uniform': uniform_samples,
+    'stratified': stratified_samples,
+    'halton': halton_samples,
+    'sobol': sobol_samples,
+}
+
+
+def sample_square(sampler: str, count: int, seed: int = None, half_side: float = 1.0) -> np.ndarray:
+    """
+    Returns ``count`` ``(x, y)`` samples of the square ``[-half_side, half_side)^2``
+    from the named sampler (one of SAMPLERS).
+    """
+    if sampler not in SAMPLERS:
+        raise ValueError(f'Unknown sampler {sampler!r}, expected one of {", ".join(SAMPLERS)}.')
+    return (SAMPLERS[sampler](count, seed) * 2 - 1) * half_side
+
+
+def _radical_inverse(index: np.ndarray, base: int) -> np.ndarray:
+    result = np.zeros(len(index))
+    factor = 1 / base
+    index = index.copy()
+    while np.any(index):
+        result += (index % base) * factor
+        index //= base
+        factor /= base
+    return result
@@ -0,0 +1,115 @@
+"""
+Perimeters of the regular polygons inscribed in and circumscribed about a circle
+of diameter 1, which bound its circumference pi from below and above.
+
+The float functions take whole arrays of side counts. The Decimal functions give
+the same bounds to any number of digits.
+"""
+import math
+from decimal import Decimal, getcontext, localcontext
+
+import numpy as np
+
+GUARD_DIGITS = 10  # Extra working digits of the Decimal mode, absorbed by the final rounding
+
+
+def inscribed_perimeters(sides) -> np.ndarray:
+    """Returns ``n * sin(pi / n)`` for every side count ``n`` in ``sides``."""
+    sides = np.asarray(sides, dtype=float)
+    return sides * np.sin(np.pi / sides)
+
+
+def circumscribed_perimeters(sides) -> np.ndarray:
+    """Returns ``n * tan(pi / n)`` for every side count ``n`` in ``sides``."""
+    sides = np.asarray(sides, dtype=float)
+    return sides * np.tan(np.pi / sides)
+
+
+def perimeter_bounds(sides) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the inscribed and circumscribed perimeters for every side count in ``sides``."""
+    return inscribed_perimeters(sides), circumscribed_perimeters(sides)
+
+
+def archimedes_bounds(doublings: int, start_sides: int = 6, digits: int = None):
+    """
+    Runs Archimedes' recurrence from the ``start_sides``-gon through ``doublings``
+    doublings of the side count. Each step takes the harmonic mean for the outer
+    perimeter, ``a' = 2ab / (a + b)``, and then the geometric mean for the inner
+    one, ``b' = sqrt(a' b)``.
+
+    Returns the side counts and the inner and outer perimeters of every step, as
+    float arrays or, with ``digits``, as lists of Decimals.
+    """
+    sides = start_sides * 2 ** np.arange(doublings + 1)
+    if digits is None:
+        inner, outer = (float(value) for value in perimeter_bounds(start_sides))
+    else:
+        inner, outer = precise_bounds(start_sides, digits + GUARD_DIGITS)
+    inners, outers = [inner], [outer]
+    with localcontext() as context:
+        if digits is not None:
+            context.prec = digits + GUARD_DIGITS
+        for _ in range(doublings):
+            outer = 2 * outer * inner / (outer + inner)
+            inner = (outer * inner).sqrt() if digits is not None else math.sqrt(outer * inner)
+            inners.append(inner)
+            outers.append(outer)
+    if digits is None:
+        return sides, np.array(inners), np.array(outers)
+    return sides, inners, outers
+
+
+def precise_bounds(sides: int, digits: int = 50) -> tuple[Decimal, Decimal]:
+    """Returns the inscribed and circumscribed perimeters of the ``sides``-gon as Decimals with ``digits`` digits."""
+    if sides < 3:
+        raise ValueError(f'A polygon needs at least 3 sides, got {sides}.')
+    with localcontext() as context:
+        context.prec = digits + GUARD_DIGITS
+        angle = _decimal_pi() / sides
+        sine, cosine = _decimal_sin_cos(angle)
+        inner, outer = sides * sine, sides * sine / cosine
+    with localcontext() as context:
+        context.prec = digits
+        return +inner, +outer
+
+
+def format_bounds(inner, outer, decimals: int) -> tuple[str, str]:
+    """
+    Formats a pair of bounds, floats or Decimals, rounded to the nearest value with
+    ``decimals`` decimals.
+    """
+    return f'{inner:.{decimals}f}', f'{outer:.{decimals}f}'
+
+
+def _decimal_pi() -> Decimal:
+    """Machin's formula, pi = 16 atan(1/5) - 4 atan(1/239), at the current precision."""
+    return 16 * _decimal_atan_inverse(5) - 4 * _decimal_atan_inverse(239)
+
+
+def _decimal_atan_inverse(x: int) -> Decimal:
+    """Taylor series of atan(1 / x) at the current precision."""
+    epsilon = Decimal(10) ** -(getcontext().prec + 2)
+    power = Decimal(1) / x
+    total, term, k = power, power, 1
+    squared = x * x
+    while term > epsilon:
+        power /= squared
+        term = power / (2 * k + 1)
+        total += -term if k % 2 else term
+        k += 1
+    return total
+
+
+def _decimal_sin_cos(angle: Decimal) -> tuple[Decimal, Decimal]:
+    """Taylor series of sine and cosine at the current precision, for angles below 1 like pi / n."""
+    epsilon = Decimal(10) ** -(getcontext().prec + 2)
+    sine, cosine = Decimal(0), Decimal(0)
+    term, k = Decimal(1), 0
+    while abs(term) > epsilon:
+        if k % 2:
+            sine += term if k % 4 == 1 else -term
+        else:
+            cosine += term if k % 4 == 0 else -term
+        k += 1
+        term = term * angle / k
+    return sine, cosine
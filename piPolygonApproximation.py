@@ -1,5 +1,10 @@
+from functools import lru_cache
+
 from manim import *
-from Lsystem import GosperCurve
+from background import GosperBackground
+from glyphs import GlyphNumber
+from perimeter import GUARD_DIGITS, format_bounds, perimeter_bounds, precise_bounds
+from polyline import straight_curves
 
 
 CIRCLE_COLOR = GREEN
@@ -21,6 +26,104 @@ BIG_POLYGON_COLOR = WHITE
 STROKE_WIDTH = 1.5
 RADIUS = 2
 
+PRECISE_DECIMALS = 15  # Beyond this the bounds come from the arbitrary-precision mode instead of floats
+
+SWEEP_MODE = False  # Sweep n continuously instead of the fixed 5, 6, 8 and 12-gon stages
+SWEEP_MAX_SIDES = 3000
+SWEEP_RUN_TIME = 10
+SWEEP_DECIMALS = 6
+
+
+class PolygonEdges:
+    """
+    A read-only sequence view of the edges of a RegularPolygonPath as Line
+    mobjects. Lines are only built when an edge is accessed, and then reused.
+    """
+
+    def __init__(self, polygon):
+        self.polygon = polygon
+        self.lines = {}
+
+    def __len__(self):
+        return len(self.polygon.vertices) - 1
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(f'Edge {index} out of range for a polygon with {len(self)} edges.')
+        index %= len(self)
+        if index not in self.lines:
+            self.lines[index] = Line(
+                self.polygon.vertices[index],
+                self.polygon.vertices[index + 1],
+                stroke_width=self.polygon.get_stroke_width(),
+                stroke_color=self.polygon.get_stroke_color()
+            )
+        return self.lines[index]
+
+
+class RegularPolygonPath(VMobject):
+    """
+    A regular polygon centered on the origin with its first vertex on the x-axis,
+    built as one VMobject from a vertex array computed in one step, so the cost
+    of building and drawing it does not depend on creating a mobject per edge.
+    Individual edges are available as Lines through :attr:`edges`.
+
+    The points live in a buffer of ``capacity`` curves. :meth:`set_count` rewrites
+    it in place for another side count, with the unused curves collapsed onto the
+    first vertex, so one mobject can sweep through many polygons.
+    """
+
+    def __init__(self, count, radius, capacity=None, **kwargs):
+        """
+        Initializes the polygon.
+
+        Parameters:
+        - count: Number of sides.
+        - radius: Distance of the vertices from the center.
+        - capacity: Largest side count :meth:`set_count` will be asked for.
+        """
+        super().__init__(**kwargs)
+        self.count = count
+        self.radius = radius
+        self.edges = PolygonEdges(self)
+        self.set_capacity(max(capacity or count, count))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def unit_vertices(count):
+        """Returns the ``count + 1`` vertices of the closed polygon with radius 1."""
+        angles = np.linspace(0, 2 * PI, count + 1)
+        vertices = np.column_stack((np.cos(angles), np.sin(angles), np.zeros(count + 1)))
+        vertices[-1] = vertices[0]
+        vertices.flags.writeable = False
+        return vertices
+
+    def set_capacity(self, capacity):
+        """
+        Resizes the point buffer to ``capacity`` curves, keeping the current polygon.
+        Animations such as Create split their run time over all curves, so a
+        polygon is best drawn at its own size and grown before a sweep.
+        """
+        if capacity < self.count:
+            raise ValueError(f'A capacity of {capacity} cannot hold the current {self.count} sides.')
+        self.capacity = capacity
+        self.set_points(np.zeros((capacity * self.n_points_per_cubic_curve, 3)))
+        return self.set_count(self.count, self.radius)
+
+    def set_count(self, count, radius):
+        """Turns the polygon into the ``count``-gon of ``radius`` by rewriting its points in place."""
+        if count > self.capacity:
+            raise ValueError(f'{count} sides do not fit a polygon with capacity {self.capacity}.')
+        self.count = count
+        self.radius = radius
+        self.vertices = radius * self.unit_vertices(count)
+        curves = self.points.reshape(self.capacity, self.n_points_per_cubic_curve, 3)
+        straight_curves(self.vertices[:-1], self.vertices[1:], self.n_points_per_cubic_curve, out=curves[:count])
+        curves[count:] = self.vertices[0]
+        self.points = curves.reshape(-1, 3)  # Same buffer unless an animation replaced it
+        self.edges.lines.clear()
+        return self
+
 
 class PiPolygonApproximation(Scene):
 
@@ -37,72 +140,55 @@ class PiPolygonApproximation(Scene):
     def draw_background(self):
         """
         Draws a Gosper Curve in the background. This uses lines generated
-        from the Lsystem.GosperCurve.
+        from the Lsystem.GosperCurve, drawn as a single
+        background.GosperBackground mobject.
         """
-        lines = GosperCurve.generate_lines(start_point=(-4, -9), direction=(-0.4, 0))
-        lines_obj = VGroup(
-            *[
-                Line(
-                    np.concatenate((line[0], [0])),
-                    np.concatenate((line[1], [0])),
-                    stroke_width=1,
-                    stroke_opacity=0.4,
-                    stroke_color=PURPLE
-                )
-                for line in lines
-            ]
-        )
-        self.add(lines_obj)
-
-    def create_line(self, radius, current_angle, next_angle, color=WHITE):
-        return Line(
-            start=(radius * np.array([np.cos(current_angle), np.sin(current_angle), 0])),
-            end=(radius * np.array([np.cos(next_angle), np.sin(next_angle), 0])),
-            stroke_width=STROKE_WIDTH,
-            stroke_color=color
-        )
+        self.add(GosperBackground(start_point=(-4, -9), direction=(-0.4, 0), stroke_opacity=0.4))
 
-    def get_polygon_perimeter(self, shape, decimals=4) -> float:
-        return float(np.round(sum([line.get_arc_length() for line in shape]) / (RADIUS / 0.5), decimals))
+    @staticmethod
+    def get_perimeter_labels(count, decimals=1) -> tuple[str, str]:
+        """
+        Returns the perimeters of the inscribed and circumscribed ``count``-gons of
+        the circle with diameter 1, rounded to ``decimals`` decimals. They are
+        computed from the closed forms (see perimeter.py), not from the drawn
+        geometry, so any number of decimals is exact.
+        """
+        if decimals > PRECISE_DECIMALS:
+            return format_bounds(*precise_bounds(count, decimals + 1 + GUARD_DIGITS), decimals)
+        return format_bounds(*(float(bound) for bound in perimeter_bounds(count)), decimals)
 
     def create_polygons(self, count):
-        outer_radius = RADIUS / np.cos(PI / count)
-        part = (2 * PI) / count
-
-        big_shape = VGroup()
-        small_shape = VGroup()
-
-        current_angle = 0
-        for i in range(count):
-            next_angle = current_angle + part
-            if i == count - 1:
-                next_angle = 0
-            big_shape.add(self.create_line(outer_radius, current_angle, next_angle, BIG_POLYGON_COLOR))
-            small_shape.add(self.create_line(RADIUS, current_angle, next_angle, SMALL_POLYGON_COLOR))
-            current_angle = next_angle
+        small_shape = RegularPolygonPath(count, RADIUS, stroke_width=STROKE_WIDTH, stroke_color=SMALL_POLYGON_COLOR)
+        big_shape = RegularPolygonPath(count, RADIUS / np.cos(PI / count), stroke_width=STROKE_WIDTH,
+                                       stroke_color=BIG_POLYGON_COLOR)
         return small_shape, big_shape
 
-    def create_length_labels(self, text, shapes, color=WHITE):
+    def create_length_labels(self, text, polygon, color=WHITE):
+        edges = polygon.edges
         return VGroup(
-            Tex(text, color=color).move_to(shapes[0].get_center() + RIGHT * LABEL_SIDE_LENGTH_SHIFT + UP * LABEL_SIDE_LENGTH_SHIFT),
-            Tex(text, color=color).move_to(shapes[1].get_center() + LEFT * LABEL_SIDE_LENGTH_SHIFT + UP * LABEL_SIDE_LENGTH_SHIFT),
-            Tex(text, color=color).move_to(shapes[2].get_center() + LEFT * LABEL_SIDE_LENGTH_SHIFT + DOWN * LABEL_SIDE_LENGTH_SHIFT),
-            Tex(text, color=color).move_to(shapes[3].get_center() + RIGHT * LABEL_SIDE_LENGTH_SHIFT + DOWN * LABEL_SIDE_LENGTH_SHIFT),
+            GlyphNumber(text=text, color=color).move_to(edges[0].get_center() + RIGHT * LABEL_SIDE_LENGTH_SHIFT + UP * LABEL_SIDE_LENGTH_SHIFT),
+            GlyphNumber(text=text, color=color).move_to(edges[1].get_center() + LEFT * LABEL_SIDE_LENGTH_SHIFT + UP * LABEL_SIDE_LENGTH_SHIFT),
+            GlyphNumber(text=text, color=color).move_to(edges[2].get_center() + LEFT * LABEL_SIDE_LENGTH_SHIFT + DOWN * LABEL_SIDE_LENGTH_SHIFT),
+            GlyphNumber(text=text, color=color).move_to(edges[3].get_center() + RIGHT * LABEL_SIDE_LENGTH_SHIFT + DOWN * LABEL_SIDE_LENGTH_SHIFT),
         )
 
     def draw_polygon_with_labels(self, text, polygon, run_time, color):
         labels = self.create_length_labels(text, polygon, color)
         for i in range(4):
             self.play(
-                Create(polygon[i], run_time=run_time),
+                Create(polygon.edges[i], run_time=run_time),
                 Write(labels[i], run_time=run_time),
                 rate_func=linear
             )
+        # Swap the drawn edges for the polygon itself, which later animations act on.
+        self.remove(*[polygon.edges[i] for i in range(4)])
+        self.add(polygon)
         self.wait(1)
         return labels
 
     def draw_polygons(self, polygons_count, pi_perimeter_group, polygons_draw_time, text_update_time, decimal=1, uncreate=True, uncreate_time=1.0):
         small_polygon, big_polygon = self.create_polygons(polygons_count)
+        small_label, big_label = self.get_perimeter_labels(polygons_count, decimal)
 
         self.play(
             Create(small_polygon),
@@ -110,13 +196,13 @@ class PiPolygonApproximation(Scene):
             run_time=polygons_draw_time
         )
 
-        small_polygon_perimeter = Tex(
-            f'{self.get_polygon_perimeter(small_polygon):.{decimal}f}',
+        small_polygon_perimeter = GlyphNumber(
+            text=small_label,
             color=SMALL_POLYGON_COLOR
         ).next_to(pi_perimeter_group[1], LEFT)
 
-        big_polygon_perimeter = Tex(
-            f'{self.get_polygon_perimeter(big_polygon):.{decimal}f}',
+        big_polygon_perimeter = GlyphNumber(
+            text=big_label,
             color=BIG_POLYGON_COLOR
         ).next_to(pi_perimeter_group[1], RIGHT)
 
@@ -150,9 +236,10 @@ class PiPolygonApproximation(Scene):
     def first_stage(self, radius_group):
         count = 4
         small_polygon, big_polygon = self.create_polygons(count)
-        small_polygon_perimeter = Tex(f'{self.get_polygon_perimeter(small_polygon):.1f}', color=SMALL_POLYGON_COLOR).next_to(big_polygon, RIGHT)
+        small_label, _ = self.get_perimeter_labels(count)
+        small_polygon_perimeter = GlyphNumber(text=small_label, color=SMALL_POLYGON_COLOR).next_to(big_polygon, RIGHT)
         pi_label = Tex(r'$< \pi <$', color=RED_D).next_to(small_polygon_perimeter, RIGHT)
-        big_polygon_perimeter = Tex('4', color=BIG_POLYGON_COLOR).next_to(pi_label, RIGHT)
+        big_polygon_perimeter = GlyphNumber(text='4', color=BIG_POLYGON_COLOR).next_to(pi_label, RIGHT)
 
         pi_perimeter_group = VGroup(small_polygon_perimeter, pi_label, big_polygon_perimeter)
         label_explanation = Tex(
@@ -170,7 +257,7 @@ class PiPolygonApproximation(Scene):
         self.play(ReplacementTransform(big_polygon_labels, big_polygon_perimeter), run_time=2)
 
         small_polygon_labels = self.draw_polygon_with_labels(
-            text=f'{self.get_polygon_perimeter(small_polygon)/4:.1f}',
+            text=f'{perimeter_bounds(count)[0] / count:.1f}',
             polygon=small_polygon,
             run_time=0.5,
             color=SMALL_POLYGON_COLOR
@@ -187,6 +274,9 @@ class PiPolygonApproximation(Scene):
         return pi_perimeter_group
 
     def second_stage(self, pi_perimeter_group):
+        if SWEEP_MODE:
+            self.draw_sweep(pi_perimeter_group)
+            return
         self.draw_polygons(5, pi_perimeter_group, 2, 2)
         self.wait(0.5)
         self.draw_polygons(6, pi_perimeter_group, 2, 1.5, uncreate_time=1)
@@ -196,3 +286,55 @@ class PiPolygonApproximation(Scene):
         self.draw_polygons(12, pi_perimeter_group, 1.5, 1, 2,False)
 
         self.wait(0.5)
+
+    def draw_sweep(self, pi_perimeter_group, first_count=4, last_count=SWEEP_MAX_SIDES):
+        """
+        Sweeps the number of sides from ``first_count`` to ``last_count`` on a single
+        pair of polygons. The side counts grow geometrically, one per frame, and
+        their vertex tables and bounds are computed before the animation starts.
+        Every frame rewrites the polygon points and the readout glyphs in place;
+        a readout only gains a glyph path when its number gets another digit.
+        """
+        frames = int(SWEEP_RUN_TIME * config.frame_rate)
+        counts = np.unique(np.geomspace(first_count, last_count, frames).round().astype(int))
+        inner, outer = perimeter_bounds(counts)
+        for count in counts:
+            RegularPolygonPath.unit_vertices(count)
+
+        small_polygon, big_polygon = self.create_polygons(first_count)
+        pi_label = pi_perimeter_group[1]
+        small_readout = GlyphNumber(inner[0], SWEEP_DECIMALS, edge_to_fix=RIGHT,
+                                    color=SMALL_POLYGON_COLOR).next_to(pi_label, LEFT)
+        big_readout = GlyphNumber(outer[0], SWEEP_DECIMALS, color=BIG_POLYGON_COLOR).next_to(pi_label, RIGHT)
+        sides_readout = VGroup(MathTex('n ='), GlyphNumber(first_count, 0)).arrange(RIGHT).next_to(pi_label, DOWN)
+
+        self.play(Create(small_polygon), Create(big_polygon), run_time=2)
+        # Grown only after Create, which would otherwise spend its run time on the collapsed curves.
+        small_polygon.set_capacity(last_count)
+        big_polygon.set_capacity(last_count)
+        self.play(
+            ReplacementTransform(pi_perimeter_group[0], small_readout),
+            ReplacementTransform(pi_perimeter_group[2], big_readout),
+            Write(sides_readout),
+            run_time=1.5
+        )
+
+        step = ValueTracker(0)
+        shown = [0]
+
+        def update_polygons(_):
+            index = int(step.get_value())
+            if index == shown[0]:
+                return
+            shown[0] = index
+            count = int(counts[index])
+            small_polygon.set_count(count, RADIUS)
+            big_polygon.set_count(count, RADIUS / np.cos(PI / count))
+            small_readout.set_value(inner[index])
+            big_readout.set_value(outer[index])
+            sides_readout[1].set_value(count)
+
+        small_polygon.add_updater(update_polygons)
+        self.play(step.animate.set_value(len(counts) - 1), run_time=SWEEP_RUN_TIME, rate_func=linear)
+        small_polygon.remove_updater(update_polygons)
+        self.wait(0.5)
@@ -1,10 +1,14 @@
 from manim import *
-from Lsystem import GosperCurve
+from background import GosperBackground
+from bake import PlayBaked, bake, bake_samples
+from glyphs import GlyphNumber
+from polyline import straight_curves
 
 
 RADIUS_COLOR = RED
 CIRCLE_COLOR = BLUE
 TEXT_COLOR = GREEN
+ROLL_RUN_TIME = 6
 
 
 class PiGraph(Scene):
@@ -19,31 +23,41 @@ class PiGraph(Scene):
     def draw_background(self):
         """
         Draws a Gosper Curve in the background. This uses lines generated
-        from the Lsystem.GosperCurve.
+        from the Lsystem.GosperCurve, drawn as a single
+        background.GosperBackground mobject.
         """
-        lines = GosperCurve.generate_lines(start_point=(3, 10), direction=(0.4, 0))
-        lines_obj = VGroup(
-            *[
-                Line(
-                    np.concatenate((line[0], [0])),
-                    np.concatenate((line[1], [0])),
-                    stroke_width=1,
-                    stroke_opacity=0.5,
-                    color=PURPLE
-                )
-                for line in lines
-            ]
-        )
-        self.add(lines_obj)
+        self.add(GosperBackground(start_point=(3, 10), direction=(0.4, 0)))
 
-    def draw_and_animate_circle(self):
-        # Function to move a dot around the circumference of a circle
-        def go_around_circle(obj):
-            offset = float(-circle.get_x() + axes.coords_to_point(0, 0)[0])
-            # Calculates the new position of the dot on the circle
-            new_position = circle.point_at_angle(offset + PI + PI / 2)
-            obj.move_to(new_position) # Moves the object (dot) to the calculated position
+    @staticmethod
+    def bake_roll(circle, radius_dot, length_line, origin, distance, run_time):
+        """
+        Bakes the motion of the dot on the rolling circle and of the unwrapped
+        length line into point tables, for all frames at once.
+
+        The circle rolls ``distance`` to the right. The dot sits at the angle
+        ``origin.x - circle.x + 3/2 pi`` on it, and the line runs from ``origin``
+        to the bottom of the circle.
+        """
+        center = circle.get_center()
+        radius = circle.width / 2
+        dot_shape = radius_dot.points - radius_dot.get_center()
+        parts = dict(center=center, radius=radius, origin=origin, distance=distance)
+
+        def dot_points(u):
+            x = center[0] + distance * u
+            angle = origin[0] - x + PI + PI / 2
+            position = np.column_stack((x + radius * np.cos(angle), center[1] + radius * np.sin(angle), 0 * u))
+            return position[:, None] + dot_shape
 
+        def line_points(u):
+            ends = np.column_stack((center[0] + distance * u, np.full_like(u, center[1] - radius), 0 * u))
+            return straight_curves(origin, ends, length_line.n_points_per_cubic_curve)
+
+        samples = bake_samples(run_time)
+        return (bake('pigraph_dot', dot_points, samples, dot_shape=dot_shape, **parts),
+                bake('pigraph_length_line', line_points, samples, **parts))
+
+    def draw_and_animate_circle(self):
         # Function for creating a line connecting the circle's center to its edge
         def create_line():
             return Line(
@@ -62,13 +76,18 @@ class PiGraph(Scene):
             stroke_color=GREEN_D
         ).move_to(UP * 3)
 
-        # Creates axes with coordinates and shifts them slightly upwards
+        # Creates axes with coordinates and shifts them slightly upwards.
+        # The coordinates are GlyphNumbers, which share one LaTeX compile.
         axes = Axes(
             x_range=[-1, 5, 1],
             y_range=[-1, 2, 1],
             x_length=12,
             y_length=6
-        ).add_coordinates().shift(UP * 0.5)
+        )
+        axes.add_coordinates(
+            {x: GlyphNumber(x, 0) for x in axes.x_axis.get_tick_range() if x},
+            {y: GlyphNumber(y, 0) for y in axes.y_axis.get_tick_range() if y}
+        ).shift(UP * 0.5)
 
         # Creates the circle to be animated
         circle = Circle(radius=1, color=CIRCLE_COLOR).move_to(UP)
@@ -125,18 +144,24 @@ class PiGraph(Scene):
 
         # Clears the first updater of the dot
         radius_dot.clear_updaters()
-        # Adds an updater to make the dot follow the circle's edge
-        radius_dot.add_updater(go_around_circle)
 
         # Creates a line connecting the circle's center to its radius (animated during rotation)
         length_line = create_line()
         self.add(length_line)
-        length_line.add_updater(lambda obj: obj.become(create_line()))
+
+        # Bakes the dot following the circle's edge and the growing line, then replays them
+        dot_table, line_table = self.bake_roll(circle, radius_dot, length_line, axes.coords_to_point(0, 0),
+                                               PI * 2, ROLL_RUN_TIME)
 
         self.wait(0.5)
 
         # Animates the rotation of the circle around the axes
-        self.play(circle.animate.shift(RIGHT * PI * 2), run_time=6)
+        self.play(
+            circle.animate.shift(RIGHT * PI * 2),
+            PlayBaked(radius_dot, dot_table),
+            PlayBaked(length_line, line_table),
+            run_time=ROLL_RUN_TIME
+        )
 
         # Transforms the dot into the Pi label at its final position
         self.play(Transform(radius_dot, t_label), run_time=1.5)
@@ -1,7 +1,12 @@
 from manim import *
 from manim.utils.rate_functions import ease_in_out_back
 
-from Lsystem import GosperCurve
+from background import GosperBackground
+from glyphs import GlyphNumber
+from montecarlo import PiEstimator, sample_square
+from point_cloud import BatchedPointAnimation, PointCloud
+from polyline import straight_curves
+from precision_run import PRECISION_RUN_PATH, load_run
 import numpy as np
 
 # --------------------------------------
@@ -23,7 +28,72 @@ RATIO_FORMULA_COLOR = MAROON_A
 RATIO_FORMULA = r'$\frac{P_{\scriptscriptstyle \square}}{P_{\displaystyle \circ}} = \frac{(2r)^2}{\pi r^2} = \frac{4}{\pi}$'
 RATIO_FORMULA_SHORT = r'$\frac{P_{\scriptscriptstyle \square}}{P_{\displaystyle \circ}} = \frac{4}{\pi}$'
 
+SAMPLE_COUNT = 250
+SAMPLE_SEED = 4
+# One of montecarlo.SAMPLERS. 'lattice' keeps the original samples, which cover a slightly smaller
+# square than the circle needs and converge to about 3.28, so use another sampler for a larger SAMPLE_COUNT.
+SAMPLER = 'lattice'
+LATTICE_MAX_COUNT = 500  # Above this the lattice bias exceeds the confidence band, see draw_points
+SAMPLE_RADIUS = 4  # Radius of the circle the samples are classified against, inscribed in the sampled square
+SAMPLE_EDGE = 39  # The lattice samples are drawn from [-SAMPLE_EDGE, SAMPLE_EDGE) * SAMPLE_SCALE, as originally
+SAMPLE_SCALE = 0.1
+SAMPLE_SLOW_COUNT = 10  # The first samples are drawn slowly, the rest quickly
+SAMPLE_SLOW_TIME = 3.25
+SAMPLE_FAST_TIME = 1.75
+RECOLOR_TIME = 3
+RECOLOR_LAG = 0.4  # Points change color in creation order, spread over this part of RECOLOR_TIME
+
+POINT_RADIUS = 0.04
+GRID_COLUMNS = 20
+GRID_SPACING = 0.1  # Point diameter plus the grid buff
+GRID_WIDTH = GRID_COLUMNS * GRID_SPACING
+
+FRACTION_SCALE = 0.7  # Numerator and denominator size relative to the rest of the formula, as in \frac
+
+CONVERGENCE_RUN_TIME = 6
+CONVERGENCE_COLOR = YELLOW
+CONVERGENCE_BAND_COLOR = YELLOW_E
+CONVERGENCE_Y_RANGE = (2.5, 4)
+
+PRECISION_RUN = PRECISION_RUN_PATH  # Written offline by precision_run.py; skipped when missing
+
 config.window_position = '830,300'
+INTERACTIVE_EMBED = True  # Opens an interactive shell at the end; only possible with the OpenGL renderer
+
+# --------------------------------------
+# Helpers
+# --------------------------------------
+class GrowingPolyline(VMobject):
+    """
+    A polyline that grows one vertex at a time inside a preallocated buffer of
+    Bézier points, so adding a vertex costs O(1) instead of copying every
+    earlier point.
+    """
+
+    def __init__(self, capacity, **kwargs):
+        """
+        Initializes an empty polyline that can hold up to ``capacity`` segments.
+        """
+        super().__init__(**kwargs)
+        self.buffer = np.zeros((self.n_points_per_cubic_curve * capacity, 3))
+        self.segments = 0
+        self.last_vertex = None
+
+    def add_vertex(self, point):
+        """
+        Appends a straight segment from the previous vertex to ``point``.
+        Vertices beyond the capacity are ignored.
+        """
+        point = np.asarray(point, dtype=float)
+        start = self.n_points_per_cubic_curve * self.segments
+        if self.last_vertex is not None and start < len(self.buffer):
+            straight_curves(self.last_vertex, point, self.n_points_per_cubic_curve,
+                            out=self.buffer[start:start + self.n_points_per_cubic_curve])
+            self.segments += 1
+            self.points = self.buffer[:start + self.n_points_per_cubic_curve]
+        self.last_vertex = point
+        return self
+
 
 # --------------------------------------
 # Scene Definition
@@ -47,7 +117,8 @@ class PiRatio(Scene):
         """
         self.draw_shapes()
         self.wait()
-        self.interactive_embed()
+        if INTERACTIVE_EMBED and config.renderer == RendererType.OPENGL:
+            self.interactive_embed()
 
     # ----------------------------------
     # Background
@@ -56,22 +127,10 @@ class PiRatio(Scene):
     def draw_background(self):
         """
         Draws a Gosper Curve in the background. This uses lines generated
-        from the Lsystem.GosperCurve.
-        """
-        lines = GosperCurve.generate_lines(start_point=(3, 10), direction=(0.4, 0))
-        lines_obj = VGroup(
-            *[
-                Line(
-                    np.concatenate((line[0], [0])),
-                    np.concatenate((line[1], [0])),
-                    stroke_width=1,
-                    stroke_opacity=0.5,
-                    color=PURPLE
-                )
-                for line in lines
-            ]
-        )
-        self.add(lines_obj)
+        from the Lsystem.GosperCurve, drawn as a single
+        background.GosperBackground mobject.
+        """
+        self.add(GosperBackground(start_point=(3, 10), direction=(0.4, 0)))
 
     # ----------------------------------
     # Shape Creation
@@ -160,8 +219,10 @@ class PiRatio(Scene):
 
         # Draw random points and animate them for a Monte Carlo approximation
         points = self.draw_points()
-        points_in_circle, points_in_square = self.animate_points(points, circle, square)
-        self.draw_ratio_calculation(points_in_circle, points_in_square, square)
+        inside = self.animate_points(points, circle, square)
+        self.draw_ratio_calculation(points, inside, square)
+        axes = self.draw_convergence(inside, square)
+        self.draw_precision_run(axes)
 
     def draw_circle_and_radius(self, circle, radius_group):
         """
@@ -231,91 +292,203 @@ class PiRatio(Scene):
         # Remove labels and transform shapes
         self.play(FadeOut(radius_group, square_length_group, square_length_label, area_formula, area_formula_short))
         self.play(
-            Transform(circle, Circle(color=GREEN, fill_color=GREEN_A, fill_opacity=0, radius=4)),
-            Transform(square, Square(side_length=8, color=BLUE)),
+            Transform(circle, Circle(color=GREEN, fill_color=GREEN_A, fill_opacity=0, radius=SAMPLE_RADIUS)),
+            Transform(square, Square(side_length=2 * SAMPLE_RADIUS, color=BLUE)),
             run_time=2
         )
 
     def draw_points(self):
         """
-        Creates and draws a random set of Dot objects to be used in the
-        Monte Carlo approximation steps. Uses np.random for coordinates.
-        """
-        np.random.seed(4)
-        edge = 39
-        points = [(np.random.randint(-edge, edge), np.random.randint(-edge, edge)) for _ in range(250)]
-        points_objects = [Dot([0.1 * x, 0.1 * y, 0], radius=0.04, color=RED) for x, y in points]
-
-        # Animate the creation of the first 10 points more slowly, then faster for the rest.
-        self.play(Succession(*[Create(point, run_time=1) for point in points_objects[:10]], lag_ratio=.25))
-        self.play(Succession(*[Create(point, run_time=0.1) for point in points_objects[10:]], lag_ratio=.07))
-        return points_objects
-
-    def animate_points(self, points_objects, circle, square):
+        Generates the samples used in the Monte Carlo approximation steps with the
+        SAMPLER as one array and draws them as a single PointCloud. The samples
+        cover the square around the circle of SAMPLE_RADIUS, so the share inside
+        the circle estimates pi / 4; only the lattice keeps its original scaling.
+        """
+        half_side = SAMPLE_RADIUS
+        if SAMPLER == 'lattice':
+            half_side = SAMPLE_EDGE * SAMPLE_SCALE
+            if SAMPLE_COUNT > LATTICE_MAX_COUNT:
+                logger.warning(f'The lattice sampler converges to about 3.28, not pi; '
+                               f'use another sampler for {SAMPLE_COUNT} samples.')
+        samples = sample_square(SAMPLER, SAMPLE_COUNT, SAMPLE_SEED, half_side=half_side)
+        _, spacing = self.grid_layout(SAMPLE_COUNT)
+        points = PointCloud(samples, colors=RED, point_radius=POINT_RADIUS * spacing / GRID_SPACING)
+
+        # Show the first points slowly, one after another, then the rest faster. Points
+        # appear without a fade: the Cairo camera writes point colors into the frame
+        # without blending, so a transparent point would cover the background.
+        run_time = SAMPLE_SLOW_TIME + SAMPLE_FAST_TIME
+        slow = min(SAMPLE_SLOW_COUNT, SAMPLE_COUNT)
+        start_times = np.interp(np.arange(SAMPLE_COUNT), [0, slow, SAMPLE_COUNT], [0, SAMPLE_SLOW_TIME / run_time, 1])
+        self.play(BatchedPointAnimation(points, start_times, 0, hide_before_start=True, run_time=run_time))
+        return points
+
+    def animate_points(self, points, circle, square):
         """
         Colors and arranges the random points into those inside the circle
         vs. those outside (but still within the bounding square).
         Then transforms shapes and points for further demonstration.
+        Classification, colors and the grid layout are computed with array math and
+        animated with one BatchedPointAnimation per step.
         """
-        circle_radius = 4
-        points_in_circle = VGroup()
-        points_in_square = VGroup()
-
-        # Separate points into inside/outside circle
-        for point in points_objects:
-            if point.get_x() ** 2 + point.get_y() ** 2 < circle_radius ** 2:
-                points_in_circle.add(point)
-            else:
-                points_in_square.add(point)
+        inside = np.sum(points.points[:, :2] ** 2, axis=1) < SAMPLE_RADIUS ** 2
 
-        self.play(
-            *[point.animate.set_color(GREEN) for point in points_in_circle],
-            *[point.animate.set_color(BLUE) for point in points_in_square],
-            run_time=3
-        )
+        recolor_starts = np.linspace(0, RECOLOR_LAG, len(inside))
+        self.play(BatchedPointAnimation(points, recolor_starts, 1 - RECOLOR_LAG,
+                                        target_rgbas=PointCloud.rgbas_from_mask(inside, GREEN, BLUE),
+                                        run_time=RECOLOR_TIME))
 
         # Arrange points in a grid for clarity
-        self.play(
-            points_in_circle.animate.arrange_in_grid(cols=20, buff=0.02).next_to(square, RIGHT).shift(UP),
-            points_in_square.animate.arrange_in_grid(cols=20, buff=0.02).next_to(square, RIGHT).shift(UP * 3),
-            run_time=2
-        )
+        self.play(BatchedPointAnimation(points, target_points=self.arrange_in_grids(inside, square), run_time=2))
 
         # Transform circle, square, and shift points
         self.play(
             Transform(circle, Circle(color=GREEN, fill_color=GREEN_A, fill_opacity=0, radius=3).shift(LEFT * 2)),
             Transform(square, Square(side_length=6, color=BLUE).shift(LEFT * 2)),
-            points_in_circle.animate.shift(LEFT * 3),
-            points_in_square.animate.shift(LEFT * 3),
+            points.animate.shift(LEFT * 3),
             run_time=2
         )
-        return points_in_circle, points_in_square
+        return inside
 
-    def draw_ratio_calculation(self, points_in_circle, points_in_square, square):
+    @staticmethod
+    def grid_layout(count):
+        """
+        Returns the grid columns and spacing for ``count`` points: GRID_COLUMNS
+        columns of GRID_SPACING by default, more and denser columns for large
+        sample counts so the blocks keep fitting next to the square.
+        """
+        cols = max(GRID_COLUMNS, int(np.ceil(np.sqrt(count))))
+        return cols, min(GRID_SPACING, GRID_WIDTH / cols)
+
+    @staticmethod
+    def arrange_in_grids(inside, square):
         """
-        Displays the final numeric ratio calculation in a MathTex object,
-        illustrating the approximation for pi derived from the ratio of
-        random points inside the circle vs. total points in the bounding square.
+        Returns grid positions for every point: points inside the circle are laid
+        out in one block right of the square, the others in a block above it.
         """
+        cols, spacing = PiRatio.grid_layout(len(inside))
+        positions = np.zeros((len(inside), 3))
+        for mask, shift in ((inside, UP), (~inside, UP * 3)):
+            block = PointCloud.grid_positions(np.count_nonzero(mask), cols, spacing)
+            if len(block):
+                left = square.get_right()[0] + DEFAULT_MOBJECT_TO_MOBJECT_BUFFER
+                block += [left - block[:, 0].min() + spacing / 2, square.get_center()[1], 0]
+                positions[mask] = block + shift
+        return positions
+
+    @staticmethod
+    def block_edge(points, point_radius):
+        """Returns the middle of the right edge of a block of points."""
+        return np.array([points[:, 0].max() + point_radius, (points[:, 1].min() + points[:, 1].max()) / 2, 0])
+
+    def draw_ratio_calculation(self, points, inside, square):
+        """
+        Displays the final numeric ratio calculation, illustrating the
+        approximation for pi derived from the ratio of random points inside the
+        circle vs. total points in the bounding square. The counts and the result
+        are GlyphNumbers, so only the fixed parts of the formula need LaTeX.
+        """
+        inside_count = int(np.count_nonzero(inside))
+        outside_count = len(inside) - inside_count
+
         def create_label():
-            template = r'\frac{points_in_circle}{points_in_square + points_in_circle} * 4 \approx result'
-            result = (len(points_in_circle) / (len(points_in_square) + len(points_in_circle))) * 4
-            return template.replace('points_in_circle', str(len(points_in_circle))) \
-                           .replace('points_in_square', str(len(points_in_square))) \
-                           .replace('result', f'{result:.3f}')
-
-        circle_points_label = Text(str(len(points_in_circle)), color=GREEN).next_to(points_in_circle, RIGHT)
-        square_points_label = Text(str(len(points_in_square)), color=BLUE).next_to(points_in_square, RIGHT)
+            result = (inside_count / (outside_count + inside_count)) * 4
+            numerator = GlyphNumber(inside_count, 0, color=GREEN)
+            denominator = VGroup(
+                GlyphNumber(outside_count, 0, color=BLUE),
+                MathTex('+'),
+                GlyphNumber(inside_count, 0, color=GREEN)
+            ).arrange(RIGHT, buff=0.1)
+            VGroup(numerator, denominator).scale(FRACTION_SCALE)
+            bar = Line(LEFT, RIGHT, stroke_width=2).set_width(max(numerator.width, denominator.width) + 0.1)
+            fraction = VGroup(numerator, bar, denominator).arrange(DOWN, buff=0.08)
+            return VGroup(fraction, MathTex(r'* 4 \approx'), GlyphNumber(result, 3)).arrange(RIGHT)
+
+        circle_points_label = Text(str(inside_count), color=GREEN).next_to(
+            self.block_edge(points.points[inside], points.point_radius), RIGHT)
+        square_points_label = Text(str(outside_count), color=BLUE).next_to(
+            self.block_edge(points.points[~inside], points.point_radius), RIGHT)
         self.play(Write(circle_points_label), Write(square_points_label), run_time=1.5)
 
-        # Text coloring is not working. It might be a problem with my TeXworks configuration.
-        equation_label = MathTex(create_label()).next_to(square, RIGHT).shift(DOWN)
-        # substrings_to_isolate=[str(len(points_in_circle)), str(len(points_in_square))]
-        # substrings_to_isolate={str(len(points_in_circle)): GREEN, str(len(points_in_square)): BLUE},
-        # equation_label.set_color_by_tex(str(len(points_in_circle)), GREEN)
-        # equation_label.set_color_by_tex(str(len(points_in_square)), BLUE)
+        equation_label = create_label().next_to(square, RIGHT).shift(DOWN)
         self.play(Write(equation_label))
 
+    def draw_convergence(self, inside, square):
+        """
+        Replays the samples in batches through a streaming PiEstimator and plots
+        the running estimate against the sample count, with its confidence band
+        and a live readout naming the sampler. Each frame only processes the
+        samples added since the previous frame and appends one vertex to each curve.
+        With the samples covering the whole square (see draw_points), the band
+        closes in on the dashed pi line for every sampler except the lattice.
+        """
+        estimator = PiEstimator(sampler=SAMPLER)
+        y_min, y_max = CONVERGENCE_Y_RANGE
+        axes = Axes(
+            x_range=[0, len(inside), max(len(inside) // 5, 1)],
+            y_range=[y_min, y_max, 0.5],
+            x_length=4,
+            y_length=1.2,
+            tips=False,
+            axis_config={'stroke_width': 1.5}
+        ).next_to(square, RIGHT).shift(DOWN * 2.75)
+        pi_line = DashedLine(axes.c2p(0, PI), axes.c2p(len(inside), PI), color=RED, stroke_width=1.5)
+
+        capacity = int(CONVERGENCE_RUN_TIME * config.frame_rate) + 2
+        estimate_line = GrowingPolyline(capacity, stroke_color=CONVERGENCE_COLOR, stroke_width=2)
+        band = VGroup(*[
+            GrowingPolyline(capacity, stroke_color=CONVERGENCE_BAND_COLOR, stroke_width=1, stroke_opacity=0.6)
+            for _ in range(2)
+        ])
+        readout = VGroup(
+            MathTex(r'\pi \approx'),
+            GlyphNumber(0, 3),
+            MathTex(r'\pm'),
+            GlyphNumber(0, 3),
+            Text(f'({estimator.sampler})', font_size=28)
+        ).arrange(RIGHT).scale(0.7).next_to(axes, UP, buff=0.1)
+        sample_count = ValueTracker(0)
+
+        def consume_batch(_):
+            count = int(sample_count.get_value())
+            if count <= estimator.samples:
+                return
+            estimator.update(inside[estimator.samples:count])
+            low, high = np.clip(estimator.interval, y_min, y_max)
+            estimate_line.add_vertex(axes.c2p(estimator.samples, np.clip(estimator.estimate, y_min, y_max)))
+            band[0].add_vertex(axes.c2p(estimator.samples, low))
+            band[1].add_vertex(axes.c2p(estimator.samples, high))
+            readout[1].set_value(estimator.estimate)
+            readout[3].set_value(estimator.confidence_z * estimator.standard_error)
+
+        self.play(Create(axes), Create(pi_line), Write(readout), run_time=1.5)
+        self.add(band, estimate_line)
+        estimate_line.add_updater(consume_batch)
+        self.play(sample_count.animate.set_value(len(inside)), run_time=CONVERGENCE_RUN_TIME, rate_func=linear)
+        estimate_line.remove_updater(consume_batch)
+        self.wait(1)
+        return axes
+
+    def draw_precision_run(self, axes):
+        """
+        Shows the result of the offline precision run (see precision_run.py) below
+        the convergence plot: the same estimate with billions of samples.
+        """
+        try:
+            run = load_run(PRECISION_RUN)
+        except FileNotFoundError:
+            logger.info(f'No precision run at {PRECISION_RUN}, run precision_run.py to create one.')
+            return
+        exponent = int(np.floor(np.log10(run.samples)))
+        mantissa = run.samples / 10 ** exponent
+        samples = f'10^{{{exponent}}}' if mantissa == 1 else rf'{mantissa:g} \cdot 10^{{{exponent}}}'
+        label = MathTex(
+            rf'{samples} \text{{ samples: }} \pi \approx {run.estimate:.6f} \pm {run.margin:.6f}',
+            color=CONVERGENCE_COLOR
+        ).scale(0.6).next_to(axes, DOWN, buff=0.15)
+        self.play(Write(label), run_time=1.5)
+        self.wait(1)
+
     def draw_area_label_and_highlight(self, shape, label, highlight_opacity):
         """
         Writes an area label near a shape and temporarily highlights the shape.
@@ -0,0 +1,133 @@
+from manim import *
+
+
+class PointCloud(PMobject):
+    """
+    A set of sample points drawn as one point-cloud mobject with per-point colors,
+    instead of one Dot mobject per point. The Cairo camera draws every point as a
+    hard-edged square, without anti-aliasing, whose side is the point's diameter.
+
+    Positions and colors live in two arrays (``points`` and ``rgbas``), so a whole
+    set of samples can be created, recolored and moved with array math.
+    """
+
+    def __init__(self, points, colors=RED, point_radius=0.04, **kwargs):
+        """
+        Initializes the point cloud.
+
+        Parameters:
+        - points: An ``(N, 2)`` or ``(N, 3)`` array of positions.
+        - colors: One color for every point, or an ``(N, 4)`` array of RGBA values.
+        - point_radius: Half the side of a point's square in scene units.
+        """
+        self.point_radius = point_radius
+        super().__init__(stroke_width=self.radius_to_stroke_width(point_radius), **kwargs)
+        points = np.asarray(points, dtype=float)
+        if points.shape[1] == 2:
+            points = np.column_stack((points, np.zeros(len(points))))
+        self.add_points(points, rgbas=self.to_rgbas(colors, len(points)))
+
+    @staticmethod
+    def radius_to_stroke_width(point_radius: float) -> float:
+        """
+        Converts a radius in scene units into the pixel thickness the Cairo camera
+        uses to draw point clouds.
+        """
+        return max(2 * point_radius * config.pixel_height / config.frame_height, 1)
+
+    @staticmethod
+    def to_rgbas(colors, count: int) -> np.ndarray:
+        """Returns an ``(count, 4)`` RGBA array for a single color or an existing RGBA array."""
+        if isinstance(colors, np.ndarray) and colors.ndim == 2:
+            return colors.astype(float)
+        return np.repeat([color_to_rgba(colors)], count, axis=0)
+
+    @staticmethod
+    def rgbas_from_mask(mask: np.ndarray, true_color, false_color) -> np.ndarray:
+        """Returns per-point RGBA values: ``true_color`` where ``mask`` is set, ``false_color`` elsewhere."""
+        return np.where(np.asarray(mask)[:, None], color_to_rgba(true_color), color_to_rgba(false_color))
+
+    @staticmethod
+    def grid_positions(count: int, cols: int, spacing: float) -> np.ndarray:
+        """
+        Returns the centers ``arrange_in_grid`` would give ``count`` equal cells:
+        row by row from the top-left, ``cols`` per row, centered on the origin.
+        """
+        index = np.arange(count)
+        rows = -(-count // cols) if count else 0
+        x = (index % cols - (min(cols, count) - 1) / 2) * spacing
+        y = ((rows - 1) / 2 - index // cols) * spacing
+        return np.column_stack((x, y, np.zeros(count)))
+
+
+def smoothstep_array(t: np.ndarray) -> np.ndarray:
+    """The smoothstep easing ``3t² - 2t³`` on a whole array of progress values in [0, 1]."""
+    return t * t * (3 - 2 * t)
+
+
+class BatchedPointAnimation(Animation):
+    """
+    Animates every point of a PointCloud on its own schedule from arrays: per-point
+    start times and durations, and target colors (RGBA) and positions. Each frame
+    computes the progress of all points and interpolates their positions and
+    colors in one vectorized step, so the cost per frame does not depend on the
+    number of Python objects.
+
+    Start times and durations are fractions of the run time. With
+    ``hide_before_start`` a point only joins the cloud once its start time has
+    passed, which turns the animation into a creation in the given order.
+    """
+
+    def __init__(self, point_cloud: PointCloud, start_times=0.0, durations=None, target_rgbas=None,
+                 target_points=None, hide_before_start=False,
+                 point_rate_func=smoothstep_array, rate_func=linear, **kwargs):
+        """
+        Initializes the animation.
+
+        Parameters:
+        - point_cloud: The PointCloud to animate.
+        - start_times: Scalar or per-point start times in [0, 1).
+        - durations: Scalar or per-point durations; by default every point runs from
+          its start to the end. A zero duration switches the point at its start.
+        - target_rgbas: Final colors, one color for all points or an ``(N, 4)`` array.
+        - target_points: Final ``(N, 3)`` positions.
+        - hide_before_start: Leaves points out of the cloud until their start time.
+        - point_rate_func: Vectorized easing applied to the progress of every point.
+        """
+        count = len(point_cloud.points)
+        self.start_times = np.broadcast_to(np.asarray(start_times, dtype=float), (count,))
+        if durations is None:
+            durations = 1 - self.start_times
+        self.durations = np.broadcast_to(np.asarray(durations, dtype=float), (count,))
+        self.target_rgbas = None if target_rgbas is None else PointCloud.to_rgbas(target_rgbas, count)
+        self.target_points = None if target_points is None else np.asarray(target_points, dtype=float)
+        self.hide_before_start = hide_before_start
+        self.point_rate_func = point_rate_func
+        super().__init__(point_cloud, rate_func=rate_func, **kwargs)
+
+    def begin(self):
+        self.starting_points = self.mobject.points.copy()
+        self.starting_rgbas = self.mobject.rgbas.copy()
+        if self.target_points is None:
+            self.target_points = self.starting_points
+        if self.target_rgbas is None:
+            self.target_rgbas = self.mobject.rgbas.copy()
+        super().begin()
+
+    def point_progress(self, alpha: float) -> np.ndarray:
+        """Returns the eased progress of every point at ``alpha``."""
+        elapsed = alpha - self.start_times
+        with np.errstate(divide='ignore', invalid='ignore'):
+            progress = np.where(self.durations > 0, elapsed / self.durations, (elapsed >= 0).astype(float))
+        return self.point_rate_func(np.clip(progress, 0, 1))
+
+    def interpolate_mobject(self, alpha: float):
+        alpha = self.rate_func(alpha)
+        eased = self.point_progress(alpha)[:, None]
+        points = self.starting_points + (self.target_points - self.starting_points) * eased
+        rgbas = self.starting_rgbas + (self.target_rgbas - self.starting_rgbas) * eased
+        if self.hide_before_start:
+            started = alpha >= self.start_times
+            points, rgbas = points[started], rgbas[started]
+        self.mobject.points = points
+        self.mobject.rgbas = rgbas
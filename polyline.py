@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def straight_handles(points_per_curve: int) -> np.ndarray:
+    """
+    Returns the ``(points_per_curve, 1)`` column of evenly spaced fractions that
+    places the control points of a straight Bézier curve along its chord.
+    """
+    handles = np.linspace(0, 1, points_per_curve)[:, None]
+    handles.flags.writeable = False
+    return handles
+
+
+def straight_curves(starts, ends, points_per_curve: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    Returns the Bézier points of the straight curves from ``starts`` to ``ends``.
+
+    ``starts`` and ``ends`` are points or stacks of points ``(..., 3)`` that
+    broadcast against each other; the result has the shape ``(...,
+    points_per_curve, 3)``. Pass the ``n_points_per_cubic_curve`` of the mobject
+    the points are for. With ``out``, the points are written into that array, such
+    as a slice of a mobject's point buffer, and it is returned.
+    """
+    starts = np.asarray(starts, dtype=float)[..., None, :]
+    ends = np.asarray(ends, dtype=float)[..., None, :]
+    points = starts + (ends - starts) * straight_handles(points_per_curve)
+    if out is None:
+        return points
+    out[...] = points
+    return out
@@ -0,0 +1,138 @@
+"""
+Offline Monte Carlo estimate of pi with billions of samples, for the precision run
+shown at the end of PiRatio.
+
+The samples are split into a fixed number of tasks, each with its own random
+stream spawned from one ``SeedSequence``. The tasks run on a process pool and
+count their hits in fixed-size chunks, so memory stays bounded however many
+samples are drawn. Hit counts are integers summed in task order, so the same
+seed, sample count and task count always give the same result, whatever the
+number of workers or the chunk size:
+
+    python precision_run.py --samples 1e9 --seed 314 --output media/precision_run.json
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from montecarlo import CONFIDENCE_Z
+
+PRECISION_RUN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media', 'precision_run.json')
+DEFAULT_TASKS = 64
+DEFAULT_CHUNK_SIZE = 2 ** 20
+
+
+class PrecisionRun(NamedTuple):
+    """The result of :func:`run_precision`."""
+    samples: int
+    hits: int
+    seed: int
+    tasks: int
+    seconds: float = math.nan
+
+    @property
+    def estimate(self) -> float:
+        return 4 * self.hits / self.samples
+
+    @property
+    def standard_error(self) -> float:
+        ratio = self.hits / self.samples
+        return 4 * math.sqrt(ratio * (1 - ratio) / self.samples)
+
+    @property
+    def margin(self) -> float:
+        """Half the width of the confidence interval, the same one PiEstimator reports."""
+        return CONFIDENCE_Z * self.standard_error
+
+
+def count_hits(seed_sequence: np.random.SeedSequence, samples: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Draws ``samples`` uniform points of the unit square from the stream of
+    ``seed_sequence`` and returns how many fall inside the quarter circle of
+    radius 1. At most ``chunk_size`` points are held in memory at a time.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed_sequence))
+    buffer = np.empty((min(samples, chunk_size), 2))
+    hits = 0
+    for start in range(0, samples, chunk_size):
+        # Points are drawn as interleaved (x, y) pairs, so the stream is consumed the
+        # same way whatever the chunk size.
+        points = buffer[:min(chunk_size, samples - start)]
+        rng.random(out=points)
+        np.multiply(points, points, out=points)
+        hits += int(np.count_nonzero(points[:, 0] + points[:, 1] < 1))
+    return hits
+
+
+def run_precision(samples: int, seed: int = 0, tasks: int = DEFAULT_TASKS, workers: int = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> PrecisionRun:
+    """
+    Estimates pi from ``samples`` points split over ``tasks`` independent streams.
+
+    The task count, not the worker count, decides how the samples and streams are
+    split, so changing ``workers`` only changes the speed, never the result.
+    """
+    if samples < 1:
+        raise ValueError(f'A precision run needs at least one sample, got {samples}.')
+    if tasks < 1:
+        raise ValueError(f'A precision run needs at least one task, got {tasks}.')
+    if chunk_size < 1:
+        raise ValueError(f'The chunk size must be positive, got {chunk_size}.')
+    start = time.perf_counter()
+    streams = np.random.SeedSequence(seed).spawn(tasks)
+    sizes = [samples // tasks + (task < samples % tasks) for task in range(tasks)]
+    chunk_sizes = [chunk_size] * tasks
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        hits = list(map(count_hits, streams, sizes, chunk_sizes))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            hits = list(executor.map(count_hits, streams, sizes, chunk_sizes))
+    return PrecisionRun(samples, sum(hits), seed, tasks, time.perf_counter() - start)
+
+
+def save_run(run: PrecisionRun, path: str = PRECISION_RUN_PATH):
+    """Writes ``run`` as JSON, with the estimate and its standard error for reference."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({**run._asdict(), 'estimate': run.estimate, 'standard_error': run.standard_error}, file, indent=2)
+
+
+def load_run(path: str = PRECISION_RUN_PATH) -> PrecisionRun:
+    """Reads a run written by :func:`save_run`."""
+    with open(path) as file:
+        data = json.load(file)
+    return PrecisionRun(*(data[field] for field in PrecisionRun._fields))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=lambda value: int(float(value)), default=10 ** 9,
+                        help='number of samples, e.g. 1e9')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tasks', type=int, default=DEFAULT_TASKS, help='independent random streams')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='samples held in memory per worker')
+    parser.add_argument('--output', default=PRECISION_RUN_PATH)
+    args = parser.parse_args()
+    if args.samples < 1:
+        parser.error('--samples must be positive')
+    if args.tasks < 1:
+        parser.error('--tasks must be positive')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be positive')
+
+    run = run_precision(args.samples, args.seed, args.tasks, args.workers, args.chunk_size)
+    save_run(run, args.output)
+    print(f'pi ≈ {run.estimate:.8f} ± {run.margin:.8f} '
+          f'from {run.samples:,} samples in {run.seconds:.1f} s, written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+"""
+Renders every Scene in the repository concurrently, one worker process per scene
+rendering each requested quality preset in turn:
+
+    python render_all.py --quality l h
+
+With ``--compare`` every render is then checked against its reference video in
+animations/: the table lists both durations and the average PSNR of their
+frames, so a change to a scene shows up as a timing shift or a low PSNR.
+
+The Scene classes are discovered by parsing the scene modules, so new scenes are
+picked up without touching this file. Before the workers start, the parent
+builds the Gosper curve backgrounds into the geometry cache and typesets every
+Tex and MathTex with literal arguments, the number glyphs included, into manim's
+Tex cache, so the workers load them instead of each generating the same files.
+Tex built from runtime values is only compiled by the scene that shows it, and
+the qualities of one scene never run at the same time, so no two workers write
+the same Tex file.
+"""
+import argparse
+import ast
+import importlib
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+QUALITIES = {
+    'l': 'low_quality',
+    'm': 'medium_quality',
+    'h': 'high_quality',
+    'p': 'production_quality',
+    'k': 'fourk_quality',
+}
+SKIPPED_MODULES = {'render_all'}
+REFERENCE_DIR = os.path.join(ROOT, 'animations')  # Published renders, named after their Scene class
+COMPARE_SIZE = (320, 180)  # Frames are compared at this size and
+COMPARE_FPS = 15  # frame rate, so renders of any quality line up with the references
+TEX_CLASSES = ('Tex', 'MathTex')
+
+
+def discover_scenes(root: str = ROOT) -> list[tuple[str, str]]:
+    """
+    Returns ``(module, class name)`` for every class in the top-level modules of
+    ``root`` that derives from a class whose name ends in ``Scene``.
+    """
+    scenes = []
+    for file_name in sorted(os.listdir(root)):
+        module, extension = os.path.splitext(file_name)
+        if extension != '.py' or module in SKIPPED_MODULES:
+            continue
+        with open(os.path.join(root, file_name), encoding='utf-8') as file:
+            tree = ast.parse(file.read(), file_name)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(_base_name(base).endswith('Scene') for base in node.bases):
+                scenes.append((module, node.name))
+    return scenes
+
+
+def background_arguments(root: str = ROOT) -> list[dict]:
+    """
+    Returns the literal keyword arguments of every ``GosperBackground(...)`` call in
+    the top-level modules of ``root``, so the backgrounds can be built ahead.
+    """
+    calls = []
+    for file_name in sorted(os.listdir(root)):
+        if not file_name.endswith('.py'):
+            continue
+        with open(os.path.join(root, file_name), encoding='utf-8') as file:
+            tree = ast.parse(file.read(), file_name)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and _base_name(node.func) == 'GosperBackground':
+                try:
+                    arguments = {keyword.arg: ast.literal_eval(keyword.value) for keyword in node.keywords}
+                except ValueError:
+                    continue
+                if arguments not in calls:
+                    calls.append(arguments)
+    return calls
+
+
+def tex_arguments(root: str = ROOT) -> list[tuple[str, tuple, dict]]:
+    """
+    Returns ``(class name, arguments, keyword arguments)`` for every ``Tex(...)`` and
+    ``MathTex(...)`` call in the top-level modules of ``root`` whose strings are
+    literals or module-level constants, so they can be typeset ahead. Keyword
+    arguments that are not literals, such as colors, do not change the typeset
+    file and are left out.
+    """
+    calls = []
+    for file_name in sorted(os.listdir(root)):
+        if not file_name.endswith('.py'):
+            continue
+        with open(os.path.join(root, file_name), encoding='utf-8') as file:
+            tree = ast.parse(file.read(), file_name)
+        constants = _module_constants(tree)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call) or _base_name(node.func) not in TEX_CLASSES:
+                continue
+            try:
+                arguments = []
+                for argument in node.args:
+                    if isinstance(argument, ast.Starred):
+                        arguments.extend(_literal(argument.value, constants))
+                    else:
+                        arguments.append(_literal(argument, constants))
+            except ValueError:
+                continue
+            keywords = {}
+            for keyword in node.keywords:
+                try:
+                    keywords[keyword.arg] = _literal(keyword.value, constants)
+                except ValueError:
+                    pass
+            call = (_base_name(node.func), tuple(arguments), keywords)
+            if arguments and call not in calls:
+                calls.append(call)
+    return calls
+
+
+def warm_caches(root: str = ROOT):
+    """
+    Builds the shared backgrounds and typesets the number glyphs and the literal
+    Tex once, before the workers need them.
+    """
+    import manim
+    from background import GosperBackground
+    from glyphs import glyph_templates
+
+    for arguments in background_arguments(root):
+        GosperBackground(**arguments)
+    for class_name, arguments, keywords in tex_arguments(root):
+        getattr(manim, class_name)(*arguments, **keywords)
+    glyph_templates()  # Its template line is assembled at runtime, so tex_arguments cannot find it
+
+
+def render_scene(module: str, class_name: str, qualities: list[str]) -> list[tuple[float, str]]:
+    """
+    Renders one scene in the calling process at each of ``qualities`` in turn and
+    returns the wall-clock seconds and the path of the movie file of each.
+    """
+    from manim import tempconfig
+
+    results = []
+    for quality in qualities:
+        start = time.perf_counter()
+        with tempconfig({'quality': QUALITIES[quality], 'preview': False, 'renderer': 'cairo'}):
+            scene = getattr(importlib.import_module(module), class_name)()
+            scene.render()
+            output = str(scene.renderer.file_writer.movie_file_path)
+        results.append((time.perf_counter() - start, output))
+    return results
+
+
+def compare_video(output: str, reference: str) -> tuple[float, float, float]:
+    """
+    Compares a render with a reference video using ffmpeg, which manim already
+    needs. Returns both durations in seconds and the average PSNR in dB of their
+    frames, resampled to COMPARE_SIZE and COMPARE_FPS (inf for identical frames).
+    """
+    width, height = COMPARE_SIZE
+    resample = f'fps={COMPARE_FPS},scale={width}:{height},format=yuv420p'
+    result = subprocess.run(['ffmpeg', '-hide_banner', '-nostats', '-i', output, '-i', reference, '-filter_complex',
+                             f'[0:v]{resample}[a];[1:v]{resample}[b];[a][b]psnr', '-f', 'null', '-'],
+                            capture_output=True, text=True, check=True)
+    durations = [int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+                 for hours, minutes, seconds in re.findall(r'Duration: (\d+):(\d+):([\d.]+)', result.stderr)[:2]]
+    match = re.search(r'average:(inf|[\d.]+)', result.stderr)
+    return durations[0], durations[1], float(match.group(1)) if match else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quality', nargs='+', choices=QUALITIES, default=['h'], help='manim quality presets')
+    parser.add_argument('--scenes', nargs='+', metavar='SCENE', help='render only these Scene classes')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (default: one per scene)')
+    parser.add_argument('--compare', action='store_true',
+                        help=f'compare every render with its reference video in {os.path.relpath(REFERENCE_DIR, ROOT)}/')
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # Workers resolve media/ and the caches relative to the repository
+    sys.path.insert(0, ROOT)
+    scenes = [scene for scene in discover_scenes() if not args.scenes or scene[1] in args.scenes]
+    qualities = list(dict.fromkeys(args.quality))
+    jobs = [(module, class_name, quality) for module, class_name in scenes for quality in qualities]
+    if not jobs:
+        parser.error('no scenes to render')
+
+    start = time.perf_counter()
+    warm_caches()
+    print(f'Caches warmed in {time.perf_counter() - start:.1f} s, rendering {len(jobs)} jobs')
+
+    results = {}
+    context = multiprocessing.get_context('spawn')  # Every worker starts with its own clean manim config
+    with ProcessPoolExecutor(max_workers=args.workers or len(scenes), mp_context=context) as executor:
+        futures = {executor.submit(render_scene, module, class_name, qualities): (module, class_name)
+                   for module, class_name in scenes}
+        for future in as_completed(futures):
+            module, class_name = futures[future]
+            try:
+                scene_results = future.result()
+            except Exception as error:
+                scene_results = [(None, f'failed: {error!r}')] * len(qualities)
+            for quality, result in zip(qualities, scene_results):
+                results[module, class_name, quality] = result
+            print(f'{class_name} done')
+
+    print()
+    print(f'{"Scene":<26}{"Quality":<9}{"Seconds":>9}  Output')
+    for job in jobs:
+        seconds, output = results[job]
+        print(f'{job[1]:<26}{job[2]:<9}{"-" if seconds is None else f"{seconds:.1f}":>9}  {output}')
+    print(f'Total wall-clock time: {time.perf_counter() - start:.1f} s')
+    if args.compare:
+        print()
+        print(f'{"Scene":<26}{"Quality":<9}{"Seconds":>9}{"Reference":>11}{"PSNR dB":>9}')
+        for job in jobs:
+            seconds, output = results[job]
+            reference = os.path.join(REFERENCE_DIR, f'{job[1]}.mp4')
+            if seconds is None or not os.path.exists(reference):
+                print(f'{job[1]:<26}{job[2]:<9}  no {"render" if seconds is None else "reference"}')
+                continue
+            duration, reference_duration, psnr = compare_video(output, reference)
+            print(f'{job[1]:<26}{job[2]:<9}{duration:>9.2f}{reference_duration:>11.2f}{psnr:>9.1f}')
+    if any(seconds is None for seconds, _ in results.values()):
+        sys.exit(1)
+
+
+def _module_constants(tree: ast.Module) -> dict:
+    """Returns the module-level names assigned a literal value, such as string constants."""
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+    return constants
+
+
+def _literal(node, constants: dict):
+    """Evaluates a literal or the name of a module-level constant; raises ValueError for anything else."""
+    if isinstance(node, ast.Name):
+        if node.id not in constants:
+            raise ValueError(f'{node.id} is not a module-level constant')
+        return constants[node.id]
+    return ast.literal_eval(node)
+
+
+def _base_name(node) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ''
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
+from functools import lru_cache
+
 from manim import *
-from Lsystem import GosperCurve
+from background import GosperBackground
+from bake import PlayBaked, bake, bake_samples
+from polyline import straight_curves
 
 BIG_CIRCLE_RADIUS = 1.5
 BIG_CIRCLE_LENGTH = 3 * PI
@@ -7,6 +11,118 @@ BIG_CIRCLE_COLOR = GREEN
 SMALL_CIRCLE_COLOR = BLUE
 START_POINT = LEFT * PI * 1.5
 TITLE = "Aristotle's  Wheel  Paradox"
+ARC_CURVES = 24  # Cubic curves in the full-circle arc template
+BAKE_MOTION = True  # Replay the rolling from baked point tables instead of running the updaters every frame
+FIRST_ROLL_TIME = 5
+SECOND_ROLL_TIME = 8
+TRACE_CAPACITY = 256  # Curves kept per traced path; older ones are overwritten
+TRACE_ANGLE_TOLERANCE = 3 * DEGREES  # Turn a traced stretch may accumulate before a new vertex is kept
+TRACE_MARKER_COLOR = YELLOW
+
+
+# --------------------------------------
+# Bézier helpers
+# --------------------------------------
+@lru_cache(maxsize=None)
+def unit_arc_template(curves=ARC_CURVES, start_angle=1.5 * PI):
+    """
+    Returns the cubic Bézier curves of a full unit circle as a ``(curves, 4, 3)``
+    array, running counterclockwise from ``start_angle``.
+    """
+    angles = start_angle + np.linspace(0, 2 * PI, curves + 1)
+    handle = 4 / 3 * np.tan(PI / (2 * curves))  # Handle length of a cubic spanning 2 * PI / curves
+    anchors = np.column_stack((np.cos(angles), np.sin(angles), np.zeros(curves + 1)))
+    tangents = np.column_stack((-np.sin(angles), np.cos(angles), np.zeros(curves + 1)))
+    template = np.stack((
+        anchors[:-1],
+        anchors[:-1] + handle * tangents[:-1],
+        anchors[1:] - handle * tangents[1:],
+        anchors[1:]
+    ), axis=1)
+    template.flags.writeable = False
+    return template
+
+
+def cubic_head(curve, t):
+    """
+    Returns the control points of the part ``[0, t]`` of a cubic Bézier curve (de
+    Casteljau). ``curve`` may be a stack of curves ``(..., 4, 3)`` with ``t``
+    broadcasting against ``(..., 1, 1)``.
+    """
+    first = curve[..., :-1, :] + t * (curve[..., 1:, :] - curve[..., :-1, :])
+    second = first[..., :-1, :] + t * (first[..., 1:, :] - first[..., :-1, :])
+    third = second[..., :-1, :] + t * (second[..., 1:, :] - second[..., :-1, :])
+    return np.stack((curve[..., 0, :], first[..., 0, :], second[..., 0, :], third[..., 0, :]), axis=-2)
+
+
+def set_segment_points(mobject, start, end):
+    """Rewrites the points of a straight one-curve VMobject such as a Line, in place where possible."""
+    points = straight_curves(start, end, mobject.n_points_per_cubic_curve)
+    if mobject.points.shape == points.shape:
+        mobject.points[:] = points
+    else:
+        mobject.set_points(points)
+    return mobject
+
+
+class PathTrace(VMobject):
+    """
+    The path of a moving point, kept in a preallocated ring buffer of straight
+    Bézier curves so its memory and per-frame cost stay bounded however long the
+    point moves.
+
+    New points extend the newest curve as long as the path keeps turning less
+    than ``angle_tolerance`` since that curve started, so straight and gently
+    curved stretches use few curves while tight turns and cusps keep their
+    detail. When the buffer is full the oldest curves are overwritten.
+    """
+
+    def __init__(self, capacity=TRACE_CAPACITY, angle_tolerance=TRACE_ANGLE_TOLERANCE, **kwargs):
+        """
+        Initializes an empty trace holding up to ``capacity`` curves.
+        """
+        super().__init__(**kwargs)
+        self.capacity = capacity
+        self.min_cosine = np.cos(angle_tolerance)
+        self.set_points(np.zeros((capacity * self.n_points_per_cubic_curve, 3)))
+        self.slot = 0  # Ring index of the newest curve
+        self.anchor = None  # Start of the newest curve, a kept vertex
+        self.tip = None  # End of the newest curve, moved while the stretch stays straight enough
+        self.direction = None  # Unit direction the newest curve started in
+
+    def add_point(self, point):
+        """
+        Extends the trace to ``point``, in O(1) time.
+        """
+        point = np.array(point, dtype=float)
+        if self.anchor is None:
+            self.anchor = point
+            self.points[:] = point  # Unused curves collapse onto the start, so they draw nothing
+            return self
+        if self.tip is not None:
+            step = point - self.tip
+            length = np.linalg.norm(step)
+            if not length:
+                return self
+            if np.dot(step, self.direction) >= self.min_cosine * length:
+                self.tip = point
+                self._write_curve()
+                return self
+            self.anchor = self.tip
+            self.slot = (self.slot + 1) % self.capacity
+        chord = point - self.anchor
+        length = np.linalg.norm(chord)
+        if not length:
+            return self
+        self.direction = chord / length
+        self.tip = point
+        self._write_curve()
+        return self
+
+    def _write_curve(self):
+        start = self.slot * self.n_points_per_cubic_curve
+        straight_curves(self.anchor, self.tip, self.n_points_per_cubic_curve,
+                        out=self.points[start:start + self.n_points_per_cubic_curve])
 
 
 class WheelVisualizer:
@@ -34,40 +150,122 @@ class WheelVisualizer:
         self.color = color
         self.max_length = max_length
         self.shift = shift
-        self.circle = self.create_arc()
-        self.line = self.create_line()
+        self.template = unit_arc_template()
+        self.circle = VMobject(color=self.color).set_z_index(2)
+        self.circle.set_points(np.zeros((len(self.template) * self.circle.n_points_per_cubic_curve, 3)))
+        self.line = Line(color=self.color)
         self.ghost_circle = None
+        self.marker = None
+        self.trace = None
+        self._update_arc(self.circle)
+        self._update_line(self.line)
         self.scene.add(self.line)
 
-    def create_arc(self):
+    def arc_angle(self, x=None):
         """
-        Creates an arc representing the wheel as it rolls.
+        Returns the angle of the arc still to be rolled out, for the current target
+        position or for an array of target x coordinates.
         """
-        angle = (2 * PI) - ((2 * PI) * ((self.target.get_x() - self.start_point[0]) / self.max_length))
-        return Arc(radius=self.radius,
-                   color=self.color,
-                   start_angle=1.5 * PI,
-                   angle=max(angle, 0),
-                   arc_center=self.target.get_center() + self.shift).set_z_index(2)
+        x = self.target.get_x() if x is None else x
+        return np.maximum((2 * PI) - ((2 * PI) * ((x - self.start_point[0]) / self.max_length)), 0)
 
-    def create_line(self):
+    def line_endpoints(self, x=None):
         """
-        Creates a rolling line beneath the wheel.
+        Returns the start and end of the rolling line beneath the wheel, for the
+        current target position or, as ``(N, 3)`` ends, for an array of target x
+        coordinates.
         """
+        x = self.target.get_x() if x is None else x
         start_point = self.start_point + self.shift + np.array((0, -self.radius, 0))
-        end_point = self.target.get_center() + self.shift + np.array((0, -self.radius, 0))
-        length = min(float(end_point[0]), self.start_point[0] + self.max_length)
-        end_point = np.array((length, end_point[1], 0))
-        return Line(start=start_point, end=end_point, color=self.color)
+        length = np.minimum(x + self.shift[0], self.start_point[0] + self.max_length)
+        end_y = self.target.get_y() + self.shift[1] - self.radius
+        end_point = np.stack(np.broadcast_arrays(length, end_y, 0.0), axis=-1).astype(float)
+        return start_point, end_point
+
+    def arc_curves(self, x):
+        """
+        Returns the Bézier curves of the arc for an array of target x coordinates
+        as a ``(N, curves, 4, 3)`` array, computed for all of them at once the same
+        way :meth:`_update_arc` computes one.
+        """
+        curves = len(self.template)
+        covered = np.minimum(self.arc_angle(x) / (2 * PI), 1) * curves
+        whole = np.floor(covered).astype(int)
+        heads = cubic_head(self.template[np.minimum(whole, curves - 1)], (covered - whole)[:, None, None])
+        ends = np.where((whole < curves)[:, None], heads[:, -1], self.template[-1, -1])
+        index = np.arange(curves)[None, :, None, None]
+        result = np.where(index < whole[:, None, None, None], self.template, ends[:, None, None])
+        partial = np.nonzero(whole < curves)[0]
+        result[partial, whole[partial]] = heads[partial]
+        centers = np.stack(np.broadcast_arrays(x + self.shift[0], self.target.get_y() + self.shift[1], 0.0), axis=-1)
+        return centers[:, None, None] + self.radius * result
+
+    def bake_roll(self, distance, run_time):
+        """
+        Bakes the arc, the rolling line and the ghost circle for the target moving
+        ``distance`` to the right, and returns the animations replaying them.
+        """
+        x0 = self.target.get_x()
+        ghost_shape = self.ghost_circle.points - self.ghost_circle.get_center()
+        parts = dict(start_point=self.start_point, target=self.target.get_center(), radius=self.radius,
+                     max_length=self.max_length, shift=self.shift, distance=distance)
+        samples = bake_samples(run_time)
+
+        def arc_points(u):
+            return self.arc_curves(x0 + distance * u).reshape(len(u), -1, 3)
+
+        def line_points(u):
+            start_point, end_points = self.line_endpoints(x0 + distance * u)
+            return straight_curves(start_point, end_points, self.line.n_points_per_cubic_curve)
+
+        def ghost_points(u):
+            _, end_points = self.line_endpoints(x0 + distance * u)
+            return (end_points + np.array((0, self.radius, 0)))[:, None] + ghost_shape
+
+        return [
+            PlayBaked(self.circle, bake('wheel_arc', arc_points, samples, curves=len(self.template), **parts)),
+            PlayBaked(self.line, bake('wheel_line', line_points, samples, **parts)),
+            PlayBaked(self.ghost_circle, bake('wheel_ghost', ghost_points, samples, ghost=ghost_shape, **parts)),
+        ]
 
     def add_ghost(self):
         """
         Adds a semi-transparent 'ghost' circle to trail the wheel's path.
+        It is moved by the line updater.
         """
         self.ghost_circle = Circle(radius=self.radius, stroke_opacity=0.5, color=GRAY).move_to(
             self.target.get_center() + self.shift).set_z_index(0)
         self.scene.add(self.ghost_circle)
-        self.ghost_circle.add_updater(lambda obj: obj.move_to(self.line.get_end() + np.array((0, self.radius, 0))))
+
+    def marker_point(self, x=None):
+        """
+        Returns the point of the wheel that touched the ground at the start, for
+        the current target position or, as ``(N, 3)`` points, for an array of
+        target x coordinates. The wheel turns once while the target moves
+        ``max_length``, so it traces a cycloid when that is its circumference and a
+        trochoid otherwise.
+        """
+        x = self.target.get_x() if x is None else x
+        travelled = np.minimum(x - self.start_point[0], self.max_length)
+        angle = 1.5 * PI - 2 * PI * travelled / self.max_length
+        # Once unrolled the wheel stops with its ghost circle, like the end of the line in line_endpoints
+        center_x = np.minimum(x + self.shift[0], self.start_point[0] + self.max_length)
+        return np.stack(np.broadcast_arrays(
+            center_x + self.radius * np.cos(angle),
+            self.target.get_y() + self.shift[1] + self.radius * np.sin(angle),
+            0.0
+        ), axis=-1).astype(float)
+
+    def add_trace(self):
+        """
+        Adds a marker on the wheel and the trace of its path, both updated every
+        frame from the target position.
+        """
+        self.marker = Dot(self.marker_point(), radius=0.05, color=TRACE_MARKER_COLOR).set_z_index(3)
+        self.trace = PathTrace(stroke_color=self.color, stroke_width=2, stroke_opacity=0.8).set_z_index(1)
+        self.trace.add_point(self.marker_point())
+        self.scene.add(self.trace, self.marker)
+        self.trace.add_updater(self._update_trace)
 
     def set_updaters(self):
         """
@@ -83,18 +281,46 @@ class WheelVisualizer:
         self.circle.clear_updaters()
         self.line.clear_updaters()
         self.ghost_circle.clear_updaters()
+        if self.trace is not None:
+            self.trace.clear_updaters()
 
     def _update_arc(self, obj):
         """
-        Updates the arc during animation.
+        Updates the arc during animation by rewriting its points in place: the
+        full template curves it covers, the head of the curve it ends in, and the
+        remaining curves collapsed onto its end point.
+        """
+        shape = (len(self.template), obj.n_points_per_cubic_curve, 3)
+        if obj.points.size != np.prod(shape):  # An animation replaced the buffer
+            obj.set_points(np.zeros((shape[0] * shape[1], 3)))
+        curves = obj.points.reshape(shape)
+        center = self.target.get_center() + self.shift
+        covered = min(self.arc_angle() / (2 * PI), 1) * len(self.template)
+        whole = int(covered)
+        np.multiply(self.template[:whole], self.radius, out=curves[:whole])
+        curves[:whole] += center
+        if whole < len(curves):
+            curves[whole] = center + self.radius * cubic_head(self.template[whole], covered - whole)
+            curves[whole + 1:] = curves[whole, -1]
+        obj.points = curves.reshape(-1, 3)
+
+    def _update_trace(self, obj):
         """
-        obj.become(self.create_arc())
+        Moves the marker and extends its trace.
+        """
+        point = self.marker_point()
+        self.marker.move_to(point)
+        obj.add_point(point)
 
     def _update_line(self, obj):
         """
-        Updates the rolling line during animation.
+        Updates the rolling line during animation by rewriting its end points, and
+        moves the ghost circle along with its end.
         """
-        obj.become(self.create_line())
+        start_point, end_point = self.line_endpoints()
+        set_segment_points(obj, start_point, end_point)
+        if self.ghost_circle is not None:
+            self.ghost_circle.move_to(end_point + np.array((0, self.radius, 0)))
 
 
 class WheelParadox(Scene):
@@ -120,22 +346,10 @@ class WheelParadox(Scene):
 
     def draw_background(self):
         """
-        Draws a Gosper Curve in the background.
-        """
-        lines = GosperCurve.generate_lines(start_point=(3, 10), direction=(0.4, 0))
-        lines_obj = VGroup(
-            *[
-                Line(
-                    np.concatenate((line[0], [0])),
-                    np.concatenate((line[1], [0])),
-                    stroke_width=1,
-                    stroke_opacity=0.5,
-                    color=PURPLE
-                )
-                for line in lines
-            ]
-        )
-        self.add(lines_obj)
+        Draws a Gosper Curve in the background, as a single
+        background.GosperBackground mobject.
+        """
+        self.add(GosperBackground(start_point=(3, 10), direction=(0.4, 0)))
 
     def create_title(self):
         """
@@ -165,10 +379,23 @@ class WheelParadox(Scene):
         self.play(Create(circle.circle), Create(small_circle.circle), run_time=3)
         circle.add_ghost()
         small_circle.add_ghost()
-        circle.set_updaters()
-        small_circle.set_updaters()
+        circle.add_trace()
+        small_circle.add_trace()
+        if not BAKE_MOTION:
+            circle.set_updaters()
+            small_circle.set_updaters()
         return circle, small_circle, help_circle
 
+    def roll(self, help_circle, wheels, run_time, *animations):
+        """
+        Rolls the wheels by moving the help circle BIG_CIRCLE_LENGTH to the right,
+        replaying their baked motion unless BAKE_MOTION is off.
+        """
+        if BAKE_MOTION:
+            animations += tuple(animation for wheel in wheels
+                                for animation in wheel.bake_roll(BIG_CIRCLE_LENGTH, run_time))
+        self.play(help_circle.animate.shift(RIGHT * BIG_CIRCLE_LENGTH), *animations, run_time=run_time)
+
     def remove_circles(self, circle, small_circle):
         """
         Removes circles and their animations from the scene.
@@ -177,7 +404,12 @@ class WheelParadox(Scene):
         self.remove(circle.circle, circle.ghost_circle)
         small_circle.remove_updaters()
         self.remove(small_circle.circle, small_circle.ghost_circle)
-        self.play(Uncreate(circle.line), Uncreate(small_circle.line), run_time=2)
+        self.play(
+            Uncreate(circle.line),
+            Uncreate(small_circle.line),
+            FadeOut(circle.trace, circle.marker, small_circle.trace, small_circle.marker),
+            run_time=2
+        )
 
     def first_part(self):
         """
@@ -191,7 +423,7 @@ class WheelParadox(Scene):
                                                                 big_circle_shift,
                                                                 small_circle_length,
                                                                 small_circle_shift)
-        self.play(help_circle.animate.shift(RIGHT * BIG_CIRCLE_LENGTH), run_time=5)
+        self.roll(help_circle, (circle, small_circle), FIRST_ROLL_TIME)
         self.wait(1)
         self.remove_circles(circle, small_circle)
 
@@ -214,9 +446,21 @@ class WheelParadox(Scene):
         self.play(Create(moving_line), run_time=2)
         self.add(static_line)
         self.wait(1)
-        moving_line.add_updater(lambda obj: obj.become(Line(
-            start=help_circle.get_center(),
-            end=circle.circle.get_last_point(),
-            color=ORANGE
-        )))
-        self.play(help_circle.animate.shift(RIGHT * BIG_CIRCLE_LENGTH), run_time=8)
\ No newline at end of file
+        if not BAKE_MOTION:
+            moving_line.add_updater(lambda obj: set_segment_points(obj, help_circle.get_center(),
+                                                                   circle.circle.get_last_point()))
+            self.roll(help_circle, (circle, small_circle), SECOND_ROLL_TIME)
+            return
+
+        # The line from the center to the end of the big arc, baked like the wheels
+        center = help_circle.get_center()
+
+        def line_points(u):
+            starts = center + np.outer(BIG_CIRCLE_LENGTH * u, RIGHT)
+            ends = circle.arc_curves(starts[:, 0])[:, -1, -1]
+            return straight_curves(starts, ends, moving_line.n_points_per_cubic_curve)
+
+        line_table = bake('wheel_center_line', line_points, bake_samples(SECOND_ROLL_TIME), center=center,
+                          start_point=circle.start_point, radius=circle.radius, max_length=circle.max_length,
+                          shift=circle.shift, distance=BIG_CIRCLE_LENGTH)
+        self.roll(help_circle, (circle, small_circle), SECOND_ROLL_TIME, PlayBaked(moving_line, line_table))
\ No newline at end of file